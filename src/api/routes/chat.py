@@ -5,6 +5,7 @@ Chat API routes for repair assistance
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, validator
 
 from ...config.settings_simple import settings
@@ -53,13 +54,31 @@ class ChatResponse(BaseModel):
     context: Dict[str, Any]
 
 
-@chat_router.post("", response_model=ChatResponse)
-async def chat_endpoint(chat_request: ChatRequest, request: Request):
-    """Chat endpoint for repair assistance with security logging"""
-    # Create audit log
+def _create_chatbot(chat_request: ChatRequest):
+    """Create a chatbot configured with the request's device context"""
+    # Import here to avoid circular imports
+    from ...chat.llm_chatbot import RepairChatbot
+
+    # Initialize chatbot with mock mode based on settings
+    chatbot = RepairChatbot(preferred_model="auto", use_mock=settings.should_use_mock_ai())
+
+    # Update context if provided
+    if chat_request.device_type:
+        chatbot.update_context(
+            device_type=chat_request.device_type,
+            device_model=chat_request.device_model,
+            issue_description=chat_request.issue_description,
+            user_skill_level=chat_request.skill_level,
+        )
+
+    return chatbot
+
+
+def _audit_chat_request(chat_request: ChatRequest, request: Request, action: str):
+    """Create an audit log entry for a chat request"""
     client_ip = get_client_ip(request)
     create_audit_log(
-        action="chat_request",
+        action=action,
         ip_address=client_ip,
         details={
             "device_type": chat_request.device_type,
@@ -69,21 +88,14 @@ async def chat_endpoint(chat_request: ChatRequest, request: Request):
         },
     )
 
-    try:
-        # Import here to avoid circular imports
-        from ...chat.llm_chatbot import RepairChatbot
 
-        # Initialize chatbot with mock mode based on settings
-        chatbot = RepairChatbot(preferred_model="auto", use_mock=settings.should_use_mock_ai())
+@chat_router.post("", response_model=ChatResponse)
+async def chat_endpoint(chat_request: ChatRequest, request: Request):
+    """Chat endpoint for repair assistance with security logging"""
+    _audit_chat_request(chat_request, request, "chat_request")
 
-        # Update context if provided
-        if chat_request.device_type:
-            chatbot.update_context(
-                device_type=chat_request.device_type,
-                device_model=chat_request.device_model,
-                issue_description=chat_request.issue_description,
-                user_skill_level=chat_request.skill_level,
-            )
+    try:
+        chatbot = _create_chatbot(chat_request)
 
         # Get response
         response = chatbot.chat(chat_request.message)
@@ -103,3 +115,18 @@ async def chat_endpoint(chat_request: ChatRequest, request: Request):
         from fastapi import HTTPException
 
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+
+
+@chat_router.post("/stream")
+async def chat_stream_endpoint(chat_request: ChatRequest, request: Request):
+    """Chat endpoint that streams the response as plain text while it is generated"""
+    _audit_chat_request(chat_request, request, "chat_stream_request")
+
+    try:
+        chatbot = _create_chatbot(chat_request)
+    except Exception as e:
+        from fastapi import HTTPException
+
+        raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+
+    return StreamingResponse(chatbot.chat_stream(chat_request.message), media_type="text/plain; charset=utf-8")
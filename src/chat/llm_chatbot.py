@@ -8,7 +8,7 @@ import os
 import time
 from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 try:
     from utils.logger import (
@@ -302,6 +302,140 @@ class RepairChatbot(LoggerMixin):
             self.add_message("assistant", fallback_response)
             return fallback_response
 
+    def chat_stream(self, user_message: str, include_context: bool = True) -> Iterator[str]:
+        """
+        Generate response for user message, yielding text as it is produced
+
+        OpenAI and Anthropic responses are streamed from the provider. Other clients
+        produce their reply in one piece, which is yielded as a single chunk.
+
+        Args:
+            user_message: User's repair question or description
+            include_context: Whether to include repair context in prompt
+
+        Yields:
+            Chunks of the chatbot response
+        """
+        if self.active_client not in ("openai", "anthropic"):
+            yield self.chat(user_message, include_context)
+            return
+
+        start_time = time.time()
+
+        # Log chat request
+        self.log_info(
+            "Processing streaming chat request",
+            message_length=len(user_message),
+            include_context=include_context,
+            active_client=self.active_client,
+        )
+
+        # Add user message to history
+        self.add_message("user", user_message)
+
+        chunks: List[str] = []
+        try:
+            if self.active_client == "openai":
+                stream = self._stream_openai(user_message, include_context)
+            else:
+                stream = self._stream_anthropic(user_message, include_context)
+
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+
+        except Exception as e:
+            duration = time.time() - start_time
+            self.log_error(
+                e,
+                "chat_stream_failed",
+                client=self.active_client,
+                message_length=len(user_message),
+                duration=duration,
+                streamed_chunks=len(chunks),
+            )
+
+            # Nothing reached the caller yet, so fall back exactly like chat()
+            if not chunks:
+                fallback_response = self._enhanced_fallback_response(user_message)
+                self.add_message("assistant", fallback_response)
+                yield fallback_response
+                return
+
+        # Add the (possibly partial) streamed response to history
+        response = "".join(chunks).strip()
+        self.add_message("assistant", response)
+
+        duration = time.time() - start_time
+        log_performance(
+            self.logger,
+            "chat_stream_completion",
+            duration,
+            client=self.active_client,
+            response_length=len(response),
+        )
+
+    def _stream_openai(self, user_message: str, include_context: bool) -> Iterator[str]:
+        """Stream response text from OpenAI"""
+        if not self.openai_client:
+            raise Exception("OpenAI client not available")
+
+        log_api_call(
+            self.logger,
+            "openai_chat_completion",
+            "POST",
+            model="gpt-4",
+            include_context=include_context,
+            stream=True,
+        )
+
+        messages = self._build_messages(user_message, include_context)
+        stream = self.openai_client.chat.completions.create(
+            model="gpt-4",
+            messages=messages,
+            max_tokens=800,
+            temperature=0.7,
+            presence_penalty=0.1,
+            frequency_penalty=0.1,
+            stream=True,
+        )
+
+        for event in stream:
+            if event.choices:
+                delta = event.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    def _stream_anthropic(self, user_message: str, include_context: bool) -> Iterator[str]:
+        """Stream response text from Anthropic Claude"""
+        if not self.anthropic_client:
+            raise Exception("Anthropic client not available")
+
+        log_api_call(
+            self.logger,
+            "anthropic_messages",
+            "POST",
+            model="claude-3-sonnet-20240229",
+            include_context=include_context,
+            stream=True,
+        )
+
+        system_prompt = self._build_system_prompt(include_context)
+        conversation = self._build_conversation_for_anthropic()
+
+        stream = self.anthropic_client.messages.create(
+            model="claude-3-sonnet-20240229",
+            max_tokens=800,
+            temperature=0.7,
+            system=system_prompt,
+            messages=conversation + [{"role": "user", "content": user_message}],
+            stream=True,
+        )
+
+        for event in stream:
+            if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                yield event.delta.text
+
     def _chat_with_openai(self, user_message: str, include_context: bool) -> str:
         """Generate response using OpenAI"""
         if not self.openai_client:
@@ -3,6 +3,7 @@ iFixit API Client for RepairGPT
 Implements Issue #8: iFixit APIクライアントの基本実装
 """
 
+import sys
 import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional
@@ -20,8 +21,11 @@ from utils.logger import (
 # Get logger instance
 logger = get_logger(__name__)
 
+# Slotted dataclasses need Python 3.10+; on older interpreters fall back to regular ones
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class Guide:
     """iFixit repair guide data structure"""
 
@@ -3,10 +3,11 @@ Offline Repair Database for RepairGPT
 Provides repair guides when online services are unavailable
 """
 
+import functools
 import json
 import logging
 from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,17 @@ class OfflineRepairDatabase:
 
     def __init__(self):
         self.guides = self._load_repair_guides()
+        # Lowercased text that searches match against, built once rather than per query and guide
+        self._searchable_texts = [f"{guide.title} {guide.device} {guide.category}".lower() for guide in self.guides]
+        self._device_names = [guide.device.lower() for guide in self.guides]
+
+        # Lookup indexes; the guide list is fixed after loading
+        self._guides_by_id = {guide.id: guide for guide in reversed(self.guides)}  # first guide wins on duplicates
+        self._all_devices = sorted({guide.device for guide in self.guides})
+        self._all_categories = sorted({guide.category for guide in self.guides})
+
+        # Memoized search, per instance; entries are tuples so callers can't alter cached results
+        self._cached_search = functools.lru_cache(maxsize=256)(self._search_uncached)
 
     def _load_repair_guides(self) -> List[OfflineGuide]:
         """Load comprehensive repair guides database"""
@@ -354,57 +366,51 @@ class OfflineRepairDatabase:
 
     def search_guides(self, query: str, device_type: str = "", limit: int = 10) -> List[OfflineGuide]:
         """Search offline repair guides"""
-        query_lower = query.lower()
+        return list(self._cached_search(query, device_type, limit))
+
+    def _search_uncached(self, query: str, device_type: str, limit: int) -> Tuple[OfflineGuide, ...]:
+        """Scan the guides for query terms, optionally restricted to a device"""
+        query_terms = query.lower().split()
         device_lower = device_type.lower()
 
         matching_guides = []
 
-        for guide in self.guides:
-            # Check if query matches guide content
-            searchable_text = f"{guide.title} {guide.device} {guide.category}".lower()
-
+        for guide, searchable_text in zip(self.guides, self._searchable_texts):
             # Add device context if provided
             if device_lower and device_lower not in searchable_text:
                 continue
 
             # Check for query matches
-            if any(term in searchable_text for term in query_lower.split()):
+            if any(term in searchable_text for term in query_terms):
                 matching_guides.append(guide)
 
         # Sort by relevance (exact device matches first)
         if device_lower:
             matching_guides.sort(key=lambda g: device_lower in g.device.lower(), reverse=True)
 
-        return matching_guides[:limit]
+        return tuple(matching_guides[:limit])
 
     def get_guide_by_id(self, guide_id: str) -> Optional[OfflineGuide]:
         """Get specific guide by ID"""
-        for guide in self.guides:
-            if guide.id == guide_id:
-                return guide
-        return None
+        return self._guides_by_id.get(guide_id)
 
     def get_guides_by_device(self, device_type: str, limit: int = 10) -> List[OfflineGuide]:
         """Get guides for specific device type"""
         device_lower = device_type.lower()
 
-        matching_guides = [guide for guide in self.guides if device_lower in guide.device.lower()]
+        matching_guides = [
+            guide for guide, device_name in zip(self.guides, self._device_names) if device_lower in device_name
+        ]
 
         return matching_guides[:limit]
 
     def get_all_devices(self) -> List[str]:
         """Get list of all devices with guides"""
-        devices = set()
-        for guide in self.guides:
-            devices.add(guide.device)
-        return sorted(list(devices))
+        return list(self._all_devices)
 
     def get_all_categories(self) -> List[str]:
         """Get list of all repair categories"""
-        categories = set()
-        for guide in self.guides:
-            categories.add(guide.category)
-        return sorted(list(categories))
+        return list(self._all_categories)
 
     def export_guides(self, filepath: str):
         """Export guides to JSON file"""
@@ -5,7 +5,7 @@ Supports Japanese and English languages
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 class I18n:
@@ -16,6 +16,8 @@ class I18n:
         self.current_language = default_language
         self.translations: Dict[str, Dict[str, Any]] = {}
         self.locales_dir = Path(__file__).parent / "locales"
+        # Resolved lookups keyed by (language, key); Streamlit reruns hit the same keys on every interaction
+        self._lookup_cache: Dict[Tuple[str, str], Optional[str]] = {}
 
         # Load all available translations
         self._load_translations()
@@ -61,14 +63,9 @@ class I18n:
         Returns:
             Translated string
         """
-        # Get translation for current language
-        translation = self._get_nested_value(self.translations.get(self.current_language, {}), key)
-
-        # Fallback to default language if not found
-        if translation is None and self.current_language != self.default_language:
-            translation = self._get_nested_value(self.translations.get(self.default_language, {}), key)
+        translation = self._lookup(key)
 
-        # Fallback to key itself if still not found
+        # Fallback to key itself if not found
         if translation is None:
             return key
 
@@ -81,6 +78,24 @@ class I18n:
 
         return translation
 
+    def _lookup(self, key: str) -> Optional[str]:
+        """Resolve a key for the current language (with default-language fallback), memoized"""
+        cache_key = (self.current_language, key)
+        try:
+            return self._lookup_cache[cache_key]
+        except KeyError:
+            pass
+
+        # Get translation for current language
+        translation = self._get_nested_value(self.translations.get(self.current_language, {}), key)
+
+        # Fallback to default language if not found
+        if translation is None and self.current_language != self.default_language:
+            translation = self._get_nested_value(self.translations.get(self.default_language, {}), key)
+
+        self._lookup_cache[cache_key] = translation
+        return translation
+
     def _get_nested_value(self, data: Dict[str, Any], key: str) -> Optional[str]:
         """Get nested dictionary value using dot notation"""
         keys = key.split(".")
@@ -97,6 +112,7 @@ class I18n:
     def reload_translations(self):
         """Reload all translation files"""
         self.translations.clear()
+        self._lookup_cache.clear()
         self._load_translations()
 
 
@@ -381,7 +381,8 @@ class ImageAnalysisService:
         """Encode image as base64 for API transmission"""
         buffer = io.BytesIO()
         image.save(buffer, format="JPEG", quality=95)
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        # getbuffer() exposes the encoded bytes without copying them as getvalue() would
+        return base64.b64encode(buffer.getbuffer()).decode("ascii")
 
     async def _analyze_with_mock(self, image: Image.Image, language: str = "en") -> AnalysisResult:
         """Generate mock analysis result for testing"""
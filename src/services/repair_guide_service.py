@@ -1,11 +1,22 @@
 """Repair Guide Service - Integrates iFixit API with RepairGPT"""
 
+import asyncio
+import functools
 import hashlib
 import json
+import math
+import operator
 import os
-from dataclasses import asdict, dataclass
+import re
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields, is_dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
 
 try:
     import redis
@@ -15,6 +26,14 @@ except ImportError:
     REDIS_AVAILABLE = False
     redis = None
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 from clients.ifixit_client import Guide, IFixitClient
 from data.offline_repair_database import OfflineRepairDatabase
 from utils.japanese_device_mapper import get_mapper
@@ -22,8 +41,11 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Slotted dataclasses need Python 3.10+; on older interpreters fall back to regular ones
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class RepairGuideResult:
     """Enhanced repair guide result with metadata"""
 
@@ -36,9 +58,90 @@ class RepairGuideResult:
     estimated_cost: Optional[str] = None
     success_rate: Optional[float] = None
 
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "RepairGuideResult":
+        """Rebuild a result from its cached form, restoring nested Guides and the datetime"""
+        values = dict(data)
+        if isinstance(values["guide"], dict):
+            values["guide"] = Guide(**values["guide"])
+        if values.get("related_guides"):
+            values["related_guides"] = [
+                Guide(**guide) if isinstance(guide, dict) else guide for guide in values["related_guides"]
+            ]
+        if isinstance(values["last_updated"], str):
+            values["last_updated"] = datetime.fromisoformat(values["last_updated"])
+        return cls(**values)
+
+
+class MappingAnalysis(NamedTuple):
+    """Counts of how the Japanese device terms in a query were mapped"""
+
+    direct_mappings: int = 0
+    fuzzy_mappings: int = 0
+    total_device_terms: int = 0
+    unmapped_terms: int = 0
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """Per-query Japanese language metrics, computed once and shared across all scored guides"""
+
+    is_japanese: bool = False
+    japanese_ratio: float = 0.0
+    mapping_quality: float = 1.0  # Device-word mapping quality used for per-filter boosts
+    fuzzy_confidence: float = 1.0
+    total_device_terms: int = 0
+    final_mapping_quality: float = 1.0  # Refined quality used for the final Japanese adjustment
+    is_mixed_language: bool = False
+
+
+class GuideSearchView(NamedTuple):
+    """Lowercased guide fields, computed once per guide and shared by filtering and scoring"""
+
+    title_lower: str
+    device_lower: str
+    category_lower: str
+    difficulty_lower: str
+    tools_lower: Tuple[str, ...]
+    tools_text: str  # tools_lower joined by _TOOLS_SEPARATOR for one-pass substring search
+
+    @classmethod
+    def from_guide(cls, guide: Guide) -> "GuideSearchView":
+        tools_lower = tuple(tool.lower() for tool in guide.tools) if guide.tools else ()
+        return cls(
+            title_lower=guide.title.lower() if guide.title else "",
+            device_lower=guide.device.lower() if guide.device else "",
+            category_lower=guide.category.lower() if guide.category else "",
+            difficulty_lower=guide.difficulty.lower() if guide.difficulty else "",
+            tools_lower=tools_lower,
+            tools_text=_TOOLS_SEPARATOR.join(tools_lower),
+        )
+
+    def has_tool(self, needle: str) -> bool:
+        """Whether any tool name contains needle"""
+        if not self.tools_lower:
+            return False
+        if _TOOLS_SEPARATOR in needle:
+            # A needle with the separator could match across two tool names
+            return any(needle in tool for tool in self.tools_lower)
+        return needle in self.tools_text
+
+
+@dataclass(frozen=True)
+class ScoringContext:
+    """Per-search values shared by every guide scored against the same query and filters"""
+
+    query_lower: str
+    analysis: QueryAnalysis
+    device_type_lower: Optional[str] = None
+    normalized_difficulty: Optional[str] = None
+    normalized_difficulty_lower: Optional[str] = None
+    normalized_category: Optional[str] = None
+    normalized_category_lower: Optional[str] = None
+
 
 # Japanese difficulty level mappings (moved outside dataclass)
-JAPANESE_DIFFICULTY_MAPPINGS: Dict[str, str] = {
+_JAPANESE_DIFFICULTY_TABLE: Dict[str, str] = {
     "初心者": "beginner",
     "しょしんしゃ": "beginner",
     "はじめて": "beginner",
@@ -69,7 +172,7 @@ JAPANESE_DIFFICULTY_MAPPINGS: Dict[str, str] = {
 }
 
 # Japanese category mappings (moved outside dataclass)
-JAPANESE_CATEGORY_MAPPINGS: Dict[str, str] = {
+_JAPANESE_CATEGORY_TABLE: Dict[str, str] = {
     "画面修理": "screen repair",
     "がめんしゅうり": "screen repair",
     "液晶修理": "screen repair",
@@ -108,8 +211,132 @@ JAPANESE_CATEGORY_MAPPINGS: Dict[str, str] = {
     "こねくたしゅうり": "connector repair",
 }
 
+# Japanese character ranges
+_JAPANESE_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0x3040, 0x309F),  # Hiragana
+    (0x30A0, 0x30FF),  # Katakana
+    (0x4E00, 0x9FAF),  # CJK Unified Ideographs (Kanji)
+    (0xFF66, 0xFF9D),  # Half-width Katakana
+)
+
+# BMP bitmap of Japanese code points: classifying a character is a single indexed load
+_JP_BITMAP = bytearray(0x10000)
+for _start, _end in _JAPANESE_RANGES:
+    _stop = _end + 1
+    _JP_BITMAP[_start:_stop] = b"\x01" * (_stop - _start)
+del _start, _end, _stop
+
+
+# The same ranges as a character class, so whole-string scans run in the C regex engine
+_JAPANESE_CHAR_RE = re.compile("[" + "".join(f"\\u{start:04X}-\\u{end:04X}" for start, end in _JAPANESE_RANGES) + "]")
+_WHITESPACE_RE = re.compile(r"\s")
+
+
+def _is_japanese_code_point(char_code: int) -> bool:
+    """Check a code point against the Japanese bitmap (all Japanese ranges lie in the BMP)."""
+    return char_code < 0x10000 and _JP_BITMAP[char_code] == 1
+
+
+@functools.lru_cache(maxsize=4096)
+def _contains_japanese(text: str) -> bool:
+    """Check whether text contains any Japanese character; repeated words and queries are cache hits"""
+    # isascii() is O(1) on CPython and covers the common English query
+    if not text or text.isascii():
+        return False
+    return _JAPANESE_CHAR_RE.search(text) is not None
+
+
+# Difficulty profiles: (explanation, base cost addition, base success rate)
+_DIFF_TABLE: Dict[str, Tuple[str, int, float]] = {
+    "easy": ("Can be completed by beginners with basic tools. Low risk of damage.", 20, 0.9),
+    "moderate": ("Requires some technical knowledge and specialized tools. Moderate risk.", 50, 0.75),
+    "difficult": (
+        "Advanced repair requiring significant expertise and specialized equipment. "
+        "High risk of damage if done incorrectly.",
+        100,
+        0.6,
+    ),
+    "very difficult": (
+        "Expert-level repair. Consider professional service unless you have extensive experience.",
+        200,
+        0.4,
+    ),
+}
+_DEFAULT_DIFF_PROFILE: Tuple[str, int, float] = ("", 200, 0.4)
+
+# Difficulty similarity groups: levels with the same group number count as similar
+_DIFFICULTY_GROUPS: Dict[str, int] = {
+    "easy": 0,
+    "beginner": 0,
+    "moderate": 1,
+    "intermediate": 1,
+    "difficult": 2,
+    "expert": 2,
+    "very difficult": 2,
+}
+
+
+def _same_difficulty_group(difficulty_lower: str, target_lower: str) -> bool:
+    """Check whether two lowercased difficulty levels fall into the same similarity group"""
+    group = _DIFFICULTY_GROUPS.get(difficulty_lower)
+    return group is not None and group == _DIFFICULTY_GROUPS.get(target_lower)
+
+
+# Japanese tool name mappings
+_JAPANESE_TOOL_TABLE: Dict[str, str] = {
+    "ドライバー": "screwdriver",
+    "どらいばー": "screwdriver",
+    "ネジ回し": "screwdriver",
+    "ねじまわし": "screwdriver",
+    "プラスドライバー": "phillips screwdriver",
+    "ぷらすどらいばー": "phillips screwdriver",
+    "ピンセット": "tweezers",
+    "ぴんせっと": "tweezers",
+    "スパチュラ": "spudger",
+    "すぱちゅら": "spudger",
+    "オープニングツール": "opening tool",
+    "おーぷにんぐつーる": "opening tool",
+    "サクションカップ": "suction cup",
+    "さくしょんかっぷ": "suction cup",
+    "ヒートガン": "heat gun",
+    "ひーとがん": "heat gun",
+    "はんだこて": "soldering iron",
+    "ハンダゴテ": "soldering iron",
+}
+
+# Public read-only views of the mapping tables. The normalizers memoize their results,
+# so a mutated table would silently disagree with lookups that are already cached.
+JAPANESE_DIFFICULTY_MAPPINGS: Mapping[str, str] = types.MappingProxyType(_JAPANESE_DIFFICULTY_TABLE)
+JAPANESE_CATEGORY_MAPPINGS: Mapping[str, str] = types.MappingProxyType(_JAPANESE_CATEGORY_TABLE)
+JAPANESE_TOOL_MAPPINGS: Mapping[str, str] = types.MappingProxyType(_JAPANESE_TOOL_TABLE)
+
+# Devices whose guides get a small confidence boost, matched as substrings of the lowercased device
+_POPULAR_DEVICE_RE = re.compile("iphone|android|switch|macbook|xbox|playstation")
+
+# Separator for joining a guide's lowercased tools into one searchable string
+_TOOLS_SEPARATOR = "\n"
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_tool_name(tool_name: str) -> str:
+    """Map a Japanese tool name to its English equivalent, returning other names unchanged"""
+    if not tool_name or tool_name.isascii():
+        return tool_name
+    return JAPANESE_TOOL_MAPPINGS.get(tool_name.lower().strip(), tool_name)
+
+
+@functools.lru_cache(maxsize=256)
+def _tool_needles(tool_names: Tuple[str, ...]) -> Tuple[Tuple[str, ...], ...]:
+    """Lowercased spellings (normalized and original, deduplicated) to look for per filter tool"""
+    return tuple(tuple(dict.fromkeys((_normalize_tool_name(name).lower(), name.lower()))) for name in tool_names)
+
+
 # Performance optimization: Pre-computed category lookup indices for O(1) access
-_CATEGORY_EXACT_LOOKUP: Dict[str, str] = JAPANESE_CATEGORY_MAPPINGS
+_CATEGORY_EXACT_LOOKUP: Mapping[str, str] = JAPANESE_CATEGORY_MAPPINGS
+# Single-pass leftmost-longest substring matcher over all category terms
+_CATEGORY_TERM_RE = re.compile(
+    "|".join(re.escape(term) for term in sorted(JAPANESE_CATEGORY_MAPPINGS, key=len, reverse=True))
+)
 _CATEGORY_PARTIAL_LOOKUP: Dict[str, str] = {}
 _CATEGORY_KEY_PARTS_INDEX: Dict[str, List[str]] = {}
 
@@ -143,6 +370,61 @@ def _build_category_indices():
 _build_category_indices()
 
 
+# Normalizers are pure functions of a small set of repeating filter values, so memoize them
+# at module level where the cache is shared by every SearchFilters instance and search.
+@functools.lru_cache(maxsize=4096)
+def _normalize_japanese_difficulty(difficulty: str) -> str:
+    """Map a Japanese difficulty level to English, returning the input if unmapped"""
+    if not difficulty:
+        return ""
+
+    # Every mapping key is Japanese, so ASCII input can never match
+    if difficulty.isascii():
+        return difficulty
+
+    # Normalize input for matching
+    normalized = difficulty.lower().strip()
+
+    # Direct mapping lookup, returning the original if no mapping found
+    return JAPANESE_DIFFICULTY_MAPPINGS.get(normalized, difficulty)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_japanese_category(category: str) -> str:
+    """Map a Japanese category name to English, returning the input if unmapped"""
+    if not category:
+        return ""
+
+    # Every mapping key and key part is Japanese, so ASCII input can never match
+    if category.isascii():
+        return category
+
+    # Normalize input for matching
+    normalized = category.lower().strip()
+
+    # Direct mapping lookup
+    english_term = JAPANESE_CATEGORY_MAPPINGS.get(normalized)
+    if english_term is not None:
+        return english_term
+
+    # Substring match: one regex scan finds the leftmost-longest known term
+    term_match = _CATEGORY_TERM_RE.search(normalized)
+    if term_match:
+        return _CATEGORY_EXACT_LOOKUP[term_match.group()]
+
+    # Enhanced partial matching using pre-computed key parts index
+    for key_signature, key_parts in _CATEGORY_KEY_PARTS_INDEX.items():
+        # Check if all key parts are present - optimized lookup
+        if key_parts and all(part in normalized for part in key_parts if part):
+            # Use pre-computed mapping for O(1) retrieval
+            english_term = _CATEGORY_PARTIAL_LOOKUP.get(key_signature)
+            if english_term:
+                return english_term
+
+    # If no mapping found, return original
+    return category
+
+
 @dataclass
 class SearchFilters:
     """Search filters for repair guides with Japanese support"""
@@ -167,18 +449,7 @@ class SearchFilters:
         Returns:
             English difficulty level string or original if no mapping found
         """
-        if not difficulty:
-            return ""
-
-        # Normalize input for matching
-        normalized = difficulty.lower().strip()
-
-        # Direct mapping lookup
-        if normalized in JAPANESE_DIFFICULTY_MAPPINGS:
-            return JAPANESE_DIFFICULTY_MAPPINGS[normalized]
-
-        # If no mapping found, return original
-        return difficulty
+        return _normalize_japanese_difficulty(difficulty)
 
     def normalize_japanese_category(self, category: str) -> str:
         """
@@ -190,78 +461,262 @@ class SearchFilters:
         Returns:
             English category name string or original if no mapping found
         """
-        if not category:
-            return ""
+        return _normalize_japanese_category(category)
 
-        # Normalize input for matching
-        normalized = category.lower().strip()
 
-        # Direct mapping lookup
-        if normalized in JAPANESE_CATEGORY_MAPPINGS:
-            return JAPANESE_CATEGORY_MAPPINGS[normalized]
+# Atomic sliding-window check-and-insert on a Redis sorted set, shared by all workers.
+# KEYS[1]: limiter key; ARGV: now (epoch seconds), window, max calls, unique member
+_RATE_LIMIT_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
 
-        # Optimized O(1) partial matching using pre-computed indices
-        # First check for direct substring matches in the category mappings
-        for japanese_term, english_term in _CATEGORY_EXACT_LOOKUP.items():
-            if japanese_term in normalized:
-                return english_term
+# After a Redis error the limiter uses its in-process counter for this long, then tries Redis again
+_REDIS_RETRY_SECONDS = 30.0
 
-        # Enhanced partial matching using pre-computed key parts index
-        for key_signature, key_parts in _CATEGORY_KEY_PARTS_INDEX.items():
-            # Check if all key parts are present - optimized lookup
-            if key_parts and all(part in normalized for part in key_parts if part):
-                # Use pre-computed mapping for O(1) retrieval
-                english_term = _CATEGORY_PARTIAL_LOOKUP.get(key_signature)
-                if english_term:
-                    return english_term
 
-        # If no mapping found, return original
-        return category
+_SEARCH_FILTER_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(SearchFilters))
+# Reads every filter field in one C-level call, returning them as a tuple
+_search_filter_values = operator.attrgetter(*_SEARCH_FILTER_FIELDS)
 
 
 class RateLimiter:
-    """Simple rate limiter for API calls"""
+    """Sliding-window rate limiter for API calls.
+
+    can_make_request reserves the call when it allows it, so concurrent searches cannot all
+    pass the check before any of them is counted. With a Redis client the window lives in a
+    sorted set so every worker shares one budget. Without Redis a per-process sliding-window
+    counter is used: only the previous and current fixed-window counts are kept, the previous
+    one weighted by its overlap with the sliding window. A Redis error switches to that
+    counter for _REDIS_RETRY_SECONDS only, after which Redis is tried again.
+    """
 
-    def __init__(self, max_calls: int = 100, time_window: int = 3600):
+    def __init__(
+        self,
+        max_calls: int = 100,
+        time_window: int = 3600,
+        redis_client: Optional[Any] = None,
+        redis_key: str = "repairgpt:ratelimit:ifixit",
+    ):
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = []
+        self.window_start = time.monotonic()
+        self.prev_count = 0
+        self.curr_count = 0
+
+        self.redis_client = redis_client
+        self.redis_key = redis_key
+        self._acquire_script = None
+        self._redis_retry_at: Optional[float] = None
+        if redis_client is not None:
+            self._redis_ready()
+
+    def _redis_failed(self, operation: str, error: Exception):
+        """Use the in-process limiter until the retry backoff has passed"""
+        logger.warning(
+            f"Redis rate limiter {operation} failed, using in-process limiter for {_REDIS_RETRY_SECONDS:.0f}s: {error}"
+        )
+        self._acquire_script = None
+        self._redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
 
-    def can_make_request(self) -> bool:
-        """Check if we can make a request within rate limits"""
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.time_window)
+    def _redis_ready(self) -> bool:
+        """Whether Redis should be used now, registering the script again once the backoff has passed"""
+        if self.redis_client is None:
+            return False
+        if self._acquire_script is not None:
+            return True
+        if self._redis_retry_at is not None and time.monotonic() < self._redis_retry_at:
+            return False
+        try:
+            self._acquire_script = self.redis_client.register_script(_RATE_LIMIT_LUA)
+        except Exception as e:
+            self._redis_failed("setup", e)
+            return False
+        self._redis_retry_at = None
+        return True
 
-        # Remove old calls
-        self.calls = [call_time for call_time in self.calls if call_time > cutoff]
+    def _redis_window_calls(self) -> List[Any]:
+        """Trim the shared window and return [ZREMRANGEBYSCORE result, ZCARD, oldest entry]"""
+        now = time.time()
+        pipe = self.redis_client.pipeline()
+        pipe.zremrangebyscore(self.redis_key, 0, now - self.time_window)
+        pipe.zcard(self.redis_key)
+        pipe.zrange(self.redis_key, 0, 0, withscores=True)
+        return pipe.execute()
+
+    def _roll_window(self, now: float) -> float:
+        """Advance the fixed window to contain ``now`` and return the time elapsed within it"""
+        elapsed = now - self.window_start
+        if elapsed >= self.time_window:
+            windows_passed = int(elapsed // self.time_window)
+            self.prev_count = self.curr_count if windows_passed == 1 else 0
+            self.curr_count = 0
+            self.window_start += windows_passed * self.time_window
+            elapsed -= windows_passed * self.time_window
+        return elapsed
+
+    def _estimated_calls(self, elapsed: float) -> float:
+        """Weighted number of calls in the sliding window ending now"""
+        return self.prev_count * (1 - elapsed / self.time_window) + self.curr_count
 
-        return len(self.calls) < self.max_calls
+    def can_make_request(self) -> bool:
+        """Check if we can make a request within rate limits, reserving the call when allowed"""
+        if self._redis_ready():
+            try:
+                now = time.time()
+                member = f"{now}:{uuid.uuid4().hex}"
+                allowed = self._acquire_script(
+                    keys=[self.redis_key], args=[now, self.time_window, self.max_calls, member]
+                )
+                return bool(int(allowed))
+            except Exception as e:
+                self._redis_failed("check", e)
+
+        elapsed = self._roll_window(time.monotonic())
+        if self._estimated_calls(elapsed) >= self.max_calls:
+            return False
+        # Nothing awaits between the check and the increment, so the reservation is atomic on the event loop
+        self.curr_count += 1
+        return True
 
     def record_request(self):
-        """Record a new API request"""
-        self.calls.append(datetime.now())
+        """Kept for compatibility: can_make_request already records the calls it allows"""
+
+    def remaining_calls(self) -> int:
+        """Get the number of requests still allowed in the current sliding window"""
+        if self._redis_ready():
+            try:
+                _, count, _ = self._redis_window_calls()
+                return max(0, self.max_calls - int(count))
+            except Exception as e:
+                self._redis_failed("count", e)
+
+        elapsed = self._roll_window(time.monotonic())
+        return max(0, int(self.max_calls - self._estimated_calls(elapsed)))
 
     def time_until_next_request(self) -> int:
         """Get seconds until next request is allowed"""
-        if self.can_make_request():
+        if self._redis_ready():
+            try:
+                _, count, oldest = self._redis_window_calls()
+                if int(count) < self.max_calls or not oldest:
+                    return 0
+                oldest_score = float(oldest[0][1])
+                return max(1, math.ceil(oldest_score + self.time_window - time.time()))
+            except Exception as e:
+                self._redis_failed("lookup", e)
+
+        elapsed = self._roll_window(time.monotonic())
+        if self._estimated_calls(elapsed) < self.max_calls:
             return 0
 
-        oldest_call = min(self.calls)
-        next_allowed = oldest_call + timedelta(seconds=self.time_window)
-        return int((next_allowed - datetime.now()).total_seconds())
+        if self.curr_count >= self.max_calls:
+            # The current window alone is full: wait for it to roll over and decay below the limit
+            decay_ratio = self.max_calls / self.curr_count if self.curr_count else 0.0
+            wait = (self.time_window - elapsed) + self.time_window * (1 - decay_ratio)
+        else:
+            # Wait until the previous window's weight has decayed enough
+            wait = self.time_window * (1 - (self.max_calls - self.curr_count) / self.prev_count) - elapsed
+
+        # Blocked right now, so never report that a request is allowed immediately
+        return max(1, math.ceil(wait))
+
+
+# Maximum number of memoized confidence scores per service
+SCORE_CACHE_SIZE = 2048
+
+# Sort key for ranking results by confidence
+_confidence_key = operator.attrgetter("confidence_score")
+
+# Cache TTLs in seconds per data domain; the domain is also the cache key prefix
+TTL_POLICY: Dict[str, int] = {
+    "search": 7200,
+    "guide_details": 86400,
+    "trending": 3600,
+    "device": 43200,
+}
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for the stdlib json path, matching orjson's output for our payloads"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _serialize_cache_value(value: Any) -> bytes:
+    """Serialize a cache payload, preferring orjson when it is installed.
+
+    orjson walks dataclasses (RepairGuideResult, Guide) natively, so callers pass
+    them as-is instead of converting with asdict() first.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=_json_default).encode()
+
+
+def _snapshot_cache_value(value: Any) -> Any:
+    """Detached plain-data copy of a cache payload for the in-process memory cache"""
+    if isinstance(value, list):
+        return [_snapshot_cache_value(item) for item in value]
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return value
+
+
+def _deserialize_cache_value(data: bytes) -> Any:
+    """Deserialize a cache payload written by _serialize_cache_value"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _cache_digest(payload: Any) -> str:
+    """Hash a cache key payload to a 32-char BLAKE2b-128 hex digest.
+
+    Strings are hashed as-is; other payloads are serialized with sorted keys so
+    the same logical key always produces the same digest.
+    """
+    if isinstance(payload, str):
+        data = payload.encode("utf-8", "surrogatepass")
+    else:
+        data = None
+        if ORJSON_AVAILABLE:
+            try:
+                data = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)
+            except orjson.JSONEncodeError:
+                # orjson rejects lone surrogates; the stdlib escapes them instead
+                pass
+        if data is None:
+            data = json.dumps(payload, default=str, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _identifier_digest(identifier: str) -> str:
+    """Digest of a cache identifier; get() and set() of the same search hash it only once"""
+    return _cache_digest(identifier)
 
 
 class CacheManager:
     """Manages caching of repair guide data"""
 
     def __init__(self, redis_url: Optional[str] = None, ttl: int = 86400):
-        self.ttl = ttl  # 24 hours default
+        self.ttl = ttl  # Default for domains without a TTL_POLICY entry
         self.redis_client = None
-        self.memory_cache = {}  # Fallback to memory cache
+        # Fallback LRU memory cache: key -> (monotonic expiry, data), least recently used first
+        self.memory_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
 
         if REDIS_AVAILABLE and (redis_url or os.getenv("REDIS_URL")):
             try:
-                self.redis_client = redis.from_url(redis_url or os.getenv("REDIS_URL"), decode_responses=True)
+                self.redis_client = redis.from_url(redis_url or os.getenv("REDIS_URL"))
                 # Test connection
                 self.redis_client.ping()
                 logger.info("Redis cache initialized successfully")
@@ -271,58 +726,66 @@ class CacheManager:
 
     def _make_key(self, prefix: str, identifier: str) -> str:
         """Create a cache key"""
-        # Hash long identifiers using SHA-256 for security
-        if len(identifier) > 100:
-            identifier = hashlib.sha256(identifier.encode()).hexdigest()
-        return f"repairgpt:{prefix}:{identifier}"
+        # Always hash so keys have a fixed length regardless of the identifier
+        return f"repairgpt:{prefix}:{_identifier_digest(identifier)}"
+
+    def ttl_for(self, domain: str) -> int:
+        """Get the TTL in seconds for a cache domain"""
+        return TTL_POLICY.get(domain, self.ttl)
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: str, domain: str = "search") -> Optional[Any]:
         """Get item from cache"""
-        cache_key = self._make_key("guide", key)
+        cache_key = self._make_key(domain, key)
 
         if self.redis_client:
             try:
                 data = self.redis_client.get(cache_key)
                 if data:
-                    return json.loads(data)
+                    return _deserialize_cache_value(data)
             except Exception as e:
                 logger.warning(f"Redis get failed: {e}")
 
         # Fallback to memory cache
         cached_item = self.memory_cache.get(cache_key)
         if cached_item:
-            if datetime.now() - cached_item["timestamp"] < timedelta(seconds=self.ttl):
-                return cached_item["data"]
+            expiry, data = cached_item
+            if time.monotonic() < expiry:
+                self.memory_cache.move_to_end(cache_key)
+                return data
             else:
                 del self.memory_cache[cache_key]
 
         return None
 
-    def set(self, key: str, value: Any):
-        """Set item in cache"""
-        cache_key = self._make_key("guide", key)
-        serialized_value = json.dumps(value, default=str)
+    def set(self, key: str, value: Any, domain: str = "search"):
+        """Set item in cache with the TTL of its domain"""
+        cache_key = self._make_key(domain, key)
+        ttl = self.ttl_for(domain)
 
         if self.redis_client:
             try:
-                self.redis_client.setex(cache_key, self.ttl, serialized_value)
+                # One round-trip: store the value and index its key under the domain
+                index_key = self._index_key(domain)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.setex(cache_key, ttl, _serialize_cache_value(value))
+                pipe.sadd(index_key, cache_key)
+                pipe.expire(index_key, ttl * 2)
+                pipe.execute()
                 return
             except Exception as e:
                 logger.warning(f"Redis set failed: {e}")
 
-        # Fallback to memory cache
-        self.memory_cache[cache_key] = {"data": value, "timestamp": datetime.now()}
+        # Fallback to memory cache; snapshot so later changes to the caller's objects don't leak in
+        self.memory_cache[cache_key] = (time.monotonic() + ttl, _snapshot_cache_value(value))
+        self.memory_cache.move_to_end(cache_key)
 
-        # Simple memory cache cleanup
-        if len(self.memory_cache) > 1000:
-            # Remove oldest 100 items
-            sorted_items = sorted(self.memory_cache.items(), key=lambda x: x[1]["timestamp"])
-            for key, _ in sorted_items[:100]:
-                del self.memory_cache[key]
+        # Evict least recently used items
+        while len(self.memory_cache) > 1000:
+            self.memory_cache.popitem(last=False)
 
-    def delete(self, key: str):
+    def delete(self, key: str, domain: str = "search"):
         """Delete item from cache"""
-        cache_key = self._make_key("guide", key)
+        cache_key = self._make_key(domain, key)
 
         if self.redis_client:
             try:
@@ -332,6 +795,45 @@ class CacheManager:
 
         self.memory_cache.pop(cache_key, None)
 
+    def _index_key(self, domain: str) -> str:
+        """Redis set holding every cache key written under a domain"""
+        return f"repairgpt:index:{domain}"
+
+    def invalidate_domain(self, domain: str, batch_size: int = 500) -> int:
+        """
+        Drop every cached entry of a domain, e.g. when upstream guide data changes.
+
+        Args:
+            domain: Cache domain to invalidate (see TTL_POLICY)
+            batch_size: Number of keys unlinked per Redis call
+
+        Returns:
+            Number of cache keys removed
+        """
+        removed = 0
+
+        if self.redis_client:
+            try:
+                index_key = self._index_key(domain)
+                batch = []
+                for cache_key in self.redis_client.sscan_iter(index_key, count=batch_size):
+                    batch.append(cache_key)
+                    if len(batch) >= batch_size:
+                        removed += self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    removed += self.redis_client.unlink(*batch)
+                self.redis_client.unlink(index_key)
+            except Exception as e:
+                logger.warning(f"Redis domain invalidation failed: {e}")
+
+        prefix = f"repairgpt:{domain}:"
+        stale_keys = [cache_key for cache_key in self.memory_cache if cache_key.startswith(prefix)]
+        for cache_key in stale_keys:
+            del self.memory_cache[cache_key]
+
+        return removed + len(stale_keys)
+
 
 class RepairGuideService:
     """Service for finding and managing repair guides"""
@@ -345,17 +847,18 @@ class RepairGuideService:
     ):
         self.ifixit_client = IFixitClient(api_key=ifixit_api_key)
         self.cache_manager = CacheManager(redis_url)
-        self.rate_limiter = RateLimiter(max_calls=100, time_window=3600)  # 100 calls/hour
-        self.offline_db = OfflineRepairDatabase() if enable_offline_fallback else None
-        # Initialize Japanese mapper with error handling
-        if enable_japanese_support:
-            try:
-                self.japanese_mapper = get_mapper()
-            except Exception as e:
-                logger.warning(f"Failed to initialize Japanese mapper: {e}")
-                self.japanese_mapper = None
-        else:
-            self.japanese_mapper = None
+        # 100 calls/hour, shared across workers through Redis when it is available
+        self.rate_limiter = RateLimiter(
+            max_calls=100,
+            time_window=3600,
+            redis_client=getattr(self.cache_manager, "redis_client", None),
+        )
+        # The offline database and Japanese mapper are built on first use (see the properties below);
+        # the factories are bound now so a disabled feature never touches them
+        self._offline_db_factory = OfflineRepairDatabase if enable_offline_fallback else None
+        self._mapper_factory = get_mapper if enable_japanese_support else None
+        # LRU of confidence scores keyed by (search context, guide fields), see _score_guides
+        self._score_cache: "OrderedDict[tuple, float]" = OrderedDict()
 
         # Safely check for redis_client existence (for testing with mocks)
         has_redis = False
@@ -368,16 +871,33 @@ class RepairGuideService:
             "RepairGuideService initialized",
             has_ifixit_key=bool(ifixit_api_key),
             has_cache=has_redis,
-            has_offline_db=bool(self.offline_db),
-            has_japanese_support=bool(self.japanese_mapper),
+            has_offline_db=enable_offline_fallback,
+            has_japanese_support=enable_japanese_support,
         )
 
+    @functools.cached_property
+    def offline_db(self) -> Optional[OfflineRepairDatabase]:
+        """Offline guide database, loaded on first offline lookup"""
+        return self._offline_db_factory() if self._offline_db_factory else None
+
+    @functools.cached_property
+    def japanese_mapper(self):
+        """Japanese device mapper, initialized on first Japanese query"""
+        if not self._mapper_factory:
+            return None
+        try:
+            return self._mapper_factory()
+        except Exception as e:
+            logger.warning(f"Failed to initialize Japanese mapper: {e}")
+            return None
+
     async def search_guides(
         self,
         query: str,
         filters: Optional[SearchFilters] = None,
         limit: int = 10,
         use_cache: bool = True,
+        enhance_related: bool = True,
     ) -> List[RepairGuideResult]:
         """Search for repair guides with enhanced features and Japanese support"""
         if not filters:
@@ -391,28 +911,31 @@ class RepairGuideService:
 
         # Check cache first
         if use_cache:
-            cached_results = self.cache_manager.get(cache_key)
+            cached_results = self._load_cached_results(self.cache_manager.get(cache_key, domain="search"))
             if cached_results:
                 logger.info(f"Retrieved {len(cached_results)} guides from cache")
-                return [RepairGuideResult(**result) for result in cached_results]
+                return cached_results
 
         # Perform search
         results = []
+        norm_diff, norm_cat = self._normalize_filter_values(filters)
+        scoring_context = self._build_scoring_context(query, filters, norm_diff, norm_cat)
 
         # Try iFixit API first
         if self.rate_limiter.can_make_request():
             try:
-                ifixit_guides = await self._search_ifixit_guides(query, filters, limit)
-                self.rate_limiter.record_request()
+                ifixit_guides = await self._search_ifixit_guides(query, filters, limit, norm_diff, norm_cat)
 
-                for guide in ifixit_guides:
+                views = [GuideSearchView.from_guide(guide) for guide in ifixit_guides]
+                scores = self._score_guides(ifixit_guides, query, filters, scoring_context, views)
+                for guide, view, score in zip(ifixit_guides, views, scores):
                     result = RepairGuideResult(
                         guide=guide,
                         source="ifixit",
-                        confidence_score=self._calculate_confidence_score(guide, query, filters),
+                        confidence_score=score,
                         last_updated=datetime.now(),
-                        difficulty_explanation=self._explain_difficulty(guide.difficulty),
-                        estimated_cost=self._estimate_repair_cost(guide),
+                        difficulty_explanation=self._explain_difficulty(guide.difficulty, view.difficulty_lower),
+                        estimated_cost=self._estimate_repair_cost(guide, view.difficulty_lower),
                     )
                     results.append(result)
 
@@ -433,12 +956,12 @@ class RepairGuideService:
             try:
                 offline_guides = await self._search_offline_guides(query, filters, limit - len(results))
 
-                for guide in offline_guides:
+                scores = self._score_guides(offline_guides, query, filters, scoring_context)
+                for guide, score in zip(offline_guides, scores):
                     result = RepairGuideResult(
                         guide=guide,
                         source="offline",
-                        confidence_score=self._calculate_confidence_score(guide, query, filters)
-                        * 0.8,  # Lower confidence for offline
+                        confidence_score=score * 0.8,  # Lower confidence for offline
                         last_updated=datetime.now() - timedelta(days=30),  # Assume offline data is older
                         difficulty_explanation=self._explain_difficulty(guide.difficulty),
                     )
@@ -451,17 +974,16 @@ class RepairGuideService:
             except Exception as e:
                 logger.error(f"Offline database unexpected error: {e}")
 
-        # Sort by confidence score
-        results.sort(key=lambda x: x.confidence_score, reverse=True)
+        # Sort by confidence score; both sources are already capped, so this orders at most `limit` results
+        results.sort(key=_confidence_key, reverse=True)
         results = results[:limit]
 
         # Cache results
         if use_cache and results:
-            cache_data = [asdict(result) for result in results]
-            self.cache_manager.set(cache_key, cache_data)
+            self.cache_manager.set(cache_key, results, domain="search")
 
         # Enhance results with related guides
-        if results:
+        if results and enhance_related:
             await self._enhance_with_related_guides(results[:3])  # Only for top 3
 
         logger.info(f"Returning {len(results)} total repair guides")
@@ -471,21 +993,21 @@ class RepairGuideService:
         self, guide_id: int, source: str = "ifixit", use_cache: bool = True
     ) -> Optional[RepairGuideResult]:
         """Get detailed information for a specific guide"""
-        cache_key = f"guide_details_{source}_{guide_id}"
+        cache_key = f"{source}_{guide_id}"
 
         # Check cache
         if use_cache:
-            cached_result = self.cache_manager.get(cache_key)
-            if cached_result:
+            cached_result = self.cache_manager.get(cache_key, domain="guide_details")
+            cached_results = self._load_cached_results([cached_result] if cached_result else None)
+            if cached_results:
                 logger.info(f"Retrieved guide {guide_id} details from cache")
-                return RepairGuideResult(**cached_result)
+                return cached_results[0]
 
         # Fetch from source
         guide = None
         if source == "ifixit" and self.rate_limiter.can_make_request():
             try:
                 guide = self.ifixit_client.get_guide(guide_id)
-                self.rate_limiter.record_request()
             except (ConnectionError, TimeoutError) as e:
                 logger.error(f"Failed to get guide {guide_id} from iFixit - connection error: {e}")
             except ValueError as e:
@@ -507,14 +1029,15 @@ class RepairGuideService:
             return None
 
         # Create enhanced result
+        difficulty_lower = guide.difficulty.lower()
         result = RepairGuideResult(
             guide=guide,
             source=source,
             confidence_score=1.0,  # Full confidence for direct fetch
             last_updated=datetime.now(),
-            difficulty_explanation=self._explain_difficulty(guide.difficulty),
-            estimated_cost=self._estimate_repair_cost(guide),
-            success_rate=self._estimate_success_rate(guide),
+            difficulty_explanation=self._explain_difficulty(guide.difficulty, difficulty_lower),
+            estimated_cost=self._estimate_repair_cost(guide, difficulty_lower),
+            success_rate=self._estimate_success_rate(guide, difficulty_lower),
         )
 
         # Get related guides
@@ -522,7 +1045,7 @@ class RepairGuideService:
 
         # Cache result
         if use_cache:
-            self.cache_manager.set(cache_key, asdict(result))
+            self.cache_manager.set(cache_key, result, domain="guide_details")
 
         logger.info(f"Retrieved detailed information for guide {guide_id}")
         return result
@@ -552,12 +1075,12 @@ class RepairGuideService:
 
     async def get_trending_guides(self, limit: int = 10) -> List[RepairGuideResult]:
         """Get trending repair guides"""
-        cache_key = f"trending_guides_{limit}"
+        cache_key = f"guides_{limit}"
 
-        # Check cache (shorter TTL for trending)
-        cached_results = self.cache_manager.get(cache_key)
+        # Check cache (trending domain has a shorter TTL)
+        cached_results = self._load_cached_results(self.cache_manager.get(cache_key, domain="trending"))
         if cached_results:
-            return [RepairGuideResult(**result) for result in cached_results]
+            return cached_results
 
         results = []
 
@@ -565,7 +1088,6 @@ class RepairGuideService:
         if self.rate_limiter.can_make_request():
             try:
                 trending_guides = self.ifixit_client.get_trending_guides(limit)
-                self.rate_limiter.record_request()
 
                 for guide in trending_guides:
                     result = RepairGuideResult(
@@ -592,29 +1114,28 @@ class RepairGuideService:
                 "laptop battery",
                 "headphones",
             ]
-            for query in popular_queries:
+            # Run the popular searches concurrently; a failing query doesn't abort the others
+            popular_results = await asyncio.gather(
+                *(self.search_guides(query, limit=2, use_cache=True) for query in popular_queries),
+                return_exceptions=True,
+            )
+            for query, search_results in zip(popular_queries, popular_results):
                 if len(results) >= limit:
                     break
-                try:
-                    search_results = await self.search_guides(query, limit=2, use_cache=True)
+                if isinstance(search_results, (ConnectionError, TimeoutError)):
+                    logger.error(f"Failed popular search for {query} - connection error: {search_results}")
+                elif isinstance(search_results, ValueError):
+                    logger.error(f"Failed popular search for {query} - invalid data: {search_results}")
+                elif isinstance(search_results, Exception):
+                    logger.error(f"Failed popular search for {query} - unexpected error: {search_results}")
+                else:
                     results.extend(search_results[:2])
-                except (ConnectionError, TimeoutError) as e:
-                    logger.error(f"Failed popular search for {query} - connection error: {e}")
-                except ValueError as e:
-                    logger.error(f"Failed popular search for {query} - invalid data: {e}")
-                except Exception as e:
-                    logger.error(f"Failed popular search for {query} - unexpected error: {e}")
 
         results = results[:limit]
 
-        # Cache with shorter TTL (1 hour)
+        # Cache with the trending TTL (1 hour)
         if results:
-            cache_data = [asdict(result) for result in results]
-            # Temporary cache with 1 hour TTL
-            original_ttl = self.cache_manager.ttl
-            self.cache_manager.ttl = 3600
-            self.cache_manager.set(cache_key, cache_data)
-            self.cache_manager.ttl = original_ttl
+            self.cache_manager.set(cache_key, results, domain="trending")
 
         return results
 
@@ -630,7 +1151,7 @@ class RepairGuideService:
         stats = {
             "redis_available": has_redis,
             "memory_cache_size": len(getattr(self.cache_manager, "memory_cache", {})),
-            "rate_limit_calls_remaining": self.rate_limiter.max_calls - len(self.rate_limiter.calls),
+            "rate_limit_calls_remaining": self.rate_limiter.remaining_calls(),
             "rate_limit_reset_in": self.rate_limiter.time_until_next_request(),
         }
 
@@ -646,21 +1167,58 @@ class RepairGuideService:
 
         return stats
 
-    async def _search_ifixit_guides(self, query: str, filters: SearchFilters, limit: int) -> List[Guide]:
-        """Search iFixit API with filters"""
-        # For now, use basic search - can be enhanced with filter application
-        guides = self.ifixit_client.search_guides(query, limit * 2)  # Get more to filter
+    def _load_cached_results(self, cached: Optional[List[Dict[str, Any]]]) -> Optional[List[RepairGuideResult]]:
+        """
+        Rehydrate cached results, treating entries that no longer fit the dataclasses as a miss.
 
-        # Apply filters
+        Args:
+            cached: Cached result dicts, or None on a cache miss
+
+        Returns:
+            RepairGuideResult list, or None if nothing usable was cached
+        """
+        if not cached:
+            return None
+        try:
+            return [RepairGuideResult.from_cache(result) for result in cached]
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached results: {e}")
+            return None
+
+    async def _search_ifixit_guides(
+        self,
+        query: str,
+        filters: SearchFilters,
+        limit: int,
+        normalized_difficulty: Optional[str] = None,
+        normalized_category: Optional[str] = None,
+    ) -> List[Guide]:
+        """Search iFixit API with filters (search_guides passes its already-normalized filter values)"""
+        # For now, use basic search - can be enhanced with filter application.
+        # The client is blocking, so run it in a thread to let concurrent searches overlap.
+        guides = await asyncio.to_thread(self.ifixit_client.search_guides, query, limit * 2)  # Get more to filter
+
+        # Apply filters; direct callers get the filter values normalized once for the whole batch
+        if normalized_difficulty is None and normalized_category is None:
+            normalized_difficulty, normalized_category = self._normalize_filter_values(filters)
         filtered_guides = []
         for guide in guides:
-            if self._guide_matches_filters(guide, filters):
+            view = GuideSearchView.from_guide(guide)
+            if self._guide_matches_filters(guide, filters, normalized_difficulty, normalized_category, view):
                 filtered_guides.append(guide)
                 if len(filtered_guides) >= limit:
                     break
 
         return filtered_guides
 
+    def _normalize_filter_values(self, filters: SearchFilters) -> Tuple[Optional[str], Optional[str]]:
+        """Normalize the difficulty and category filters once per search."""
+        norm_diff = (
+            filters.normalize_japanese_difficulty(filters.difficulty_level) if filters.difficulty_level else None
+        )
+        norm_cat = filters.normalize_japanese_category(filters.category) if filters.category else None
+        return norm_diff, norm_cat
+
     async def _search_offline_guides(self, query: str, filters: SearchFilters, limit: int) -> List[Guide]:
         """Search offline database"""
         if not self.offline_db:
@@ -678,22 +1236,34 @@ class RepairGuideService:
         # This would get from offline database
         return None
 
-    def _guide_matches_filters(self, guide: Guide, filters: SearchFilters) -> bool:
+    def _guide_matches_filters(
+        self,
+        guide: Guide,
+        filters: SearchFilters,
+        normalized_difficulty: Optional[str] = None,
+        normalized_category: Optional[str] = None,
+        view: Optional[GuideSearchView] = None,
+    ) -> bool:
         """Check if guide matches search filters with Japanese support"""
+        if view is None:
+            view = GuideSearchView.from_guide(guide)
+
         # Enhanced difficulty matching with Japanese normalization
         if filters.difficulty_level:
-            normalized_difficulty = filters.normalize_japanese_difficulty(filters.difficulty_level)
+            if normalized_difficulty is None:
+                normalized_difficulty = filters.normalize_japanese_difficulty(filters.difficulty_level)
 
             # Check for exact match first
-            if guide.difficulty.lower() == normalized_difficulty.lower():
+            target_lower = normalized_difficulty.lower()
+            if view.difficulty_lower == target_lower:
                 pass  # Match found
             # Check for similar difficulty levels
-            elif not self._is_similar_difficulty(guide.difficulty, normalized_difficulty):
+            elif not _same_difficulty_group(view.difficulty_lower, target_lower):
                 return False
 
         # Enhanced device type matching
         if filters.device_type:
-            device_lower = guide.device.lower()
+            device_lower = view.device_lower
             filter_device_lower = filters.device_type.lower()
 
             # Direct match
@@ -715,8 +1285,9 @@ class RepairGuideService:
 
         # Enhanced category matching with Japanese normalization
         if filters.category:
-            normalized_category = filters.normalize_japanese_category(filters.category)
-            guide_category_lower = guide.category.lower()
+            if normalized_category is None:
+                normalized_category = filters.normalize_japanese_category(filters.category)
+            guide_category_lower = view.category_lower
 
             # Check if normalized category matches
             if normalized_category.lower() not in guide_category_lower:
@@ -725,27 +1296,15 @@ class RepairGuideService:
                     return False
 
         # Tool filtering (unchanged but enhanced error handling)
+        # Each filter tool matches by its Japanese-normalized or its original spelling
         if filters.required_tools:
-            guide_tools_lower = [tool.lower() for tool in guide.tools] if guide.tools else []
-            for required_tool in filters.required_tools:
-                # Normalize Japanese tool names if needed
-                normalized_tool = self._normalize_japanese_tool_name(required_tool)
-
-                if not any(normalized_tool.lower() in tool for tool in guide_tools_lower):
-                    # Also try original tool name
-                    if not any(required_tool.lower() in tool for tool in guide_tools_lower):
-                        return False
+            for spellings in _tool_needles(tuple(filters.required_tools)):
+                if not any(view.has_tool(spelling) for spelling in spellings):
+                    return False
 
         if filters.exclude_tools:
-            guide_tools_lower = [tool.lower() for tool in guide.tools] if guide.tools else []
-            for excluded_tool in filters.exclude_tools:
-                # Normalize Japanese tool names if needed
-                normalized_tool = self._normalize_japanese_tool_name(excluded_tool)
-
-                if any(normalized_tool.lower() in tool for tool in guide_tools_lower):
-                    return False
-                # Also check original tool name
-                if any(excluded_tool.lower() in tool for tool in guide_tools_lower):
+            for spellings in _tool_needles(tuple(filters.exclude_tools)):
+                if any(view.has_tool(spelling) for spelling in spellings):
                     return False
 
         return True
@@ -760,35 +1319,16 @@ class RepairGuideService:
         Returns:
             Normalized tool name
         """
-        if not tool_name:
-            return tool_name
-
-        # Basic Japanese tool mappings
-        tool_mappings = {
-            "ドライバー": "screwdriver",
-            "どらいばー": "screwdriver",
-            "ネジ回し": "screwdriver",
-            "ねじまわし": "screwdriver",
-            "プラスドライバー": "phillips screwdriver",
-            "ぷらすどらいばー": "phillips screwdriver",
-            "ピンセット": "tweezers",
-            "ぴんせっと": "tweezers",
-            "スパチュラ": "spudger",
-            "すぱちゅら": "spudger",
-            "オープニングツール": "opening tool",
-            "おーぷにんぐつーる": "opening tool",
-            "サクションカップ": "suction cup",
-            "さくしょんかっぷ": "suction cup",
-            "ヒートガン": "heat gun",
-            "ひーとがん": "heat gun",
-            "はんだこて": "soldering iron",
-            "ハンダゴテ": "soldering iron",
-        }
+        return _normalize_tool_name(tool_name)
 
-        normalized = tool_name.lower().strip()
-        return tool_mappings.get(normalized, tool_name)
-
-    def _calculate_confidence_score(self, guide: Guide, query: str, filters: SearchFilters) -> float:
+    def _calculate_confidence_score(
+        self,
+        guide: Guide,
+        query: str,
+        filters: SearchFilters,
+        context: Optional[ScoringContext] = None,
+        view: Optional[GuideSearchView] = None,
+    ) -> float:
         """Calculate confidence score for guide relevance with enhanced Japanese optimization.
 
         This method provides sophisticated confidence scoring for repair guides,
@@ -799,30 +1339,31 @@ class RepairGuideService:
             guide: The repair guide to score
             query: The original search query
             filters: Search filters applied
+            context: Per-search values from _build_scoring_context, computed if omitted
+            view: Lowercased guide fields, computed if omitted
 
         Returns:
             Confidence score between 0.0 and 1.0
         """
+        if context is None:
+            context = self._build_scoring_context(query, filters)
+        if view is None:
+            view = GuideSearchView.from_guide(guide)
+
         # Start with base score
         score = 0.5
 
         # Normalize inputs for consistent processing
-        query_lower = query.lower() if query else ""
-        title_lower = guide.title.lower() if guide.title else ""
-        device_lower = guide.device.lower() if guide.device else ""
+        query_lower = context.query_lower
+        title_lower = view.title_lower
+        device_lower = view.device_lower
 
         # Enhanced Japanese query detection and analysis
-        is_japanese_search = self._is_japanese_query(query)
-
-        # Calculate Japanese metrics with deterministic values
-        japanese_ratio = 0.0
-        japanese_mapping_quality = 1.0
-        fuzzy_match_confidence = 1.0
-
-        if is_japanese_search:
-            japanese_ratio = self._calculate_japanese_ratio(query)
-            japanese_mapping_quality = self._assess_japanese_mapping_quality(query)
-            fuzzy_match_confidence = self._evaluate_fuzzy_matching_confidence(query)
+        analysis = context.analysis
+        is_japanese_search = analysis.is_japanese
+        japanese_ratio = analysis.japanese_ratio
+        japanese_mapping_quality = analysis.mapping_quality
+        fuzzy_match_confidence = analysis.fuzzy_confidence
 
         # Exact matches boost score with Japanese-specific adjustments
         if query_lower and query_lower in title_lower:
@@ -835,9 +1376,8 @@ class RepairGuideService:
                 score += base_boost
 
         # Device type matching with enhanced Japanese support
-        if filters.device_type and device_lower:
-            device_type_lower = filters.device_type.lower()
-            if device_type_lower in device_lower:
+        if context.device_type_lower and device_lower:
+            if context.device_type_lower in device_lower:
                 base_boost = 0.2
                 if is_japanese_search:
                     # Deterministic bonus for successful Japanese device mapping
@@ -847,13 +1387,10 @@ class RepairGuideService:
                     score += base_boost
 
         # Enhanced difficulty matching with Japanese normalization quality assessment
-        if filters.difficulty_level and guide.difficulty:
-            normalized_difficulty = filters.normalize_japanese_difficulty(filters.difficulty_level)
-            guide_difficulty_lower = guide.difficulty.lower()
-            normalized_difficulty_lower = normalized_difficulty.lower()
-
+        if context.normalized_difficulty is not None and guide.difficulty:
+            normalized_difficulty = context.normalized_difficulty
             # Check for exact match
-            if guide_difficulty_lower == normalized_difficulty_lower:
+            if view.difficulty_lower == context.normalized_difficulty_lower:
                 base_boost = 0.1
                 if is_japanese_search and normalized_difficulty != filters.difficulty_level:
                     # Deterministic bonus for successful Japanese difficulty mapping
@@ -863,7 +1400,7 @@ class RepairGuideService:
                     score += base_boost
 
             # Check for approximate difficulty matches
-            elif self._is_similar_difficulty(guide.difficulty, normalized_difficulty):
+            elif _same_difficulty_group(view.difficulty_lower, context.normalized_difficulty_lower):
                 base_boost = 0.05
                 if is_japanese_search:
                     # Deterministic reduced bonus for approximate matches
@@ -873,14 +1410,10 @@ class RepairGuideService:
                     score += base_boost
 
         # Enhanced category matching with Japanese normalization assessment
-        if filters.category and guide.category:
-            normalized_category = filters.normalize_japanese_category(filters.category)
-            guide_category_lower = guide.category.lower()
-            normalized_category_lower = normalized_category.lower()
-
-            if normalized_category_lower in guide_category_lower:
+        if context.normalized_category is not None and guide.category:
+            if context.normalized_category_lower in view.category_lower:
                 base_boost = 0.15
-                if is_japanese_search and normalized_category != filters.category:
+                if is_japanese_search and context.normalized_category != filters.category:
                     # Deterministic bonus for successful Japanese category mapping
                     mapping_bonus = min(0.05 * japanese_mapping_quality, 0.08)
                     score += base_boost + mapping_bonus
@@ -888,41 +1421,13 @@ class RepairGuideService:
                     score += base_boost
 
         # Popular devices get deterministic slight boost
-        popular_devices = [
-            "iphone",
-            "android",
-            "switch",
-            "macbook",
-            "xbox",
-            "playstation",
-        ]
-        if device_lower and any(device in device_lower for device in popular_devices):
+        if device_lower and _POPULAR_DEVICE_RE.search(device_lower):
             score += 0.05
 
         # Advanced Japanese device mapping quality assessment (deterministic)
-        if is_japanese_search and self.japanese_mapper:
-            try:
-                # Detailed device mapping analysis with consistent results
-                mapping_analysis = self._analyze_device_mapping_quality(query)
-                direct_mappings = mapping_analysis.get("direct_mappings", 0)
-                fuzzy_mappings = mapping_analysis.get("fuzzy_mappings", 0)
-                total_device_terms = mapping_analysis.get("total_device_terms", 0)
-
-                if total_device_terms > 0:
-                    # Deterministic weight calculation for direct vs fuzzy mappings
-                    weighted_mapping_quality = (direct_mappings * 1.0 + fuzzy_mappings * 0.7) / total_device_terms
-                    # Apply fuzzy matching confidence factor deterministically
-                    final_mapping_quality = min(weighted_mapping_quality * fuzzy_match_confidence, 1.0)
-
-                    # Deterministic score adjustment based on refined mapping quality
-                    mapping_bonus = min(0.1 * final_mapping_quality, 0.15)
-                    score += mapping_bonus
-                    japanese_mapping_quality = final_mapping_quality
-
-            except Exception as e:
-                logger.debug(f"Error in advanced Japanese mapping quality assessment: {e}")
-                # Use fallback deterministic value
-                japanese_mapping_quality = 0.8
+        if is_japanese_search and analysis.total_device_terms > 0:
+            score += 0.1 * analysis.final_mapping_quality
+        japanese_mapping_quality = analysis.final_mapping_quality
 
         # Quality indicators with deterministic Japanese content consideration
         quality_bonus = 0.0
@@ -958,13 +1463,132 @@ class RepairGuideService:
                 score += 0.05
 
         # Mixed language query handling (deterministic)
-        if self._is_mixed_language_query(query):
+        if analysis.is_mixed_language:
             # Deterministic moderate adjustment for mixed language queries
             score *= 0.95
 
         # Ensure score is within valid range and deterministic
         return min(max(score, 0.0), 1.0)
 
+    def _build_scoring_context(
+        self,
+        query: str,
+        filters: SearchFilters,
+        normalized_difficulty: Optional[str] = None,
+        normalized_category: Optional[str] = None,
+    ) -> ScoringContext:
+        """
+        Precompute everything confidence scoring needs that does not depend on the guide.
+
+        Args:
+            query: The search query
+            filters: Search filters applied
+            normalized_difficulty: Already-normalized difficulty filter, if available
+            normalized_category: Already-normalized category filter, if available
+
+        Returns:
+            ScoringContext shared across all guides of one search
+        """
+        if normalized_difficulty is None and filters.difficulty_level:
+            normalized_difficulty = filters.normalize_japanese_difficulty(filters.difficulty_level)
+        if normalized_category is None and filters.category:
+            normalized_category = filters.normalize_japanese_category(filters.category)
+
+        return ScoringContext(
+            query_lower=query.lower() if query else "",
+            analysis=self._analyze_query(query),
+            device_type_lower=filters.device_type.lower() if filters.device_type else None,
+            normalized_difficulty=normalized_difficulty,
+            normalized_difficulty_lower=normalized_difficulty.lower() if normalized_difficulty is not None else None,
+            normalized_category=normalized_category,
+            normalized_category_lower=normalized_category.lower() if normalized_category is not None else None,
+        )
+
+    def _score_guides(
+        self,
+        guides: List[Guide],
+        query: str,
+        filters: SearchFilters,
+        context: ScoringContext,
+        views: Optional[List[GuideSearchView]] = None,
+    ) -> List[float]:
+        """Score a batch of guides against one search, reusing the per-search context.
+
+        Scores are memoized across searches: the key holds everything the score depends on,
+        so overlapping results of repeated or related searches are not rescored.
+        """
+        if views is None:
+            views = [GuideSearchView.from_guide(guide) for guide in guides]
+
+        scores = []
+        for guide, view in zip(guides, views):
+            key = (
+                context,
+                view,
+                bool(guide.parts),
+                bool(guide.image_url),
+                filters.difficulty_level,
+                filters.category,
+            )
+            score = self._score_cache.get(key)
+            if score is None:
+                score = self._calculate_confidence_score(guide, query, filters, context, view)
+                self._score_cache[key] = score
+                if len(self._score_cache) > SCORE_CACHE_SIZE:
+                    self._score_cache.popitem(last=False)
+            else:
+                self._score_cache.move_to_end(key)
+            scores.append(score)
+        return scores
+
+    def _analyze_query(self, query: str) -> QueryAnalysis:
+        """
+        Compute the query-dependent Japanese metrics used by confidence scoring.
+
+        Args:
+            query: Search query to analyze
+
+        Returns:
+            QueryAnalysis shared by every guide scored against this query
+        """
+        if not self._is_japanese_query(query):
+            return QueryAnalysis(is_mixed_language=self._is_mixed_language_query(query))
+
+        mapping_quality = self._assess_japanese_mapping_quality(query)
+        fuzzy_confidence = self._evaluate_fuzzy_matching_confidence(query)
+        total_device_terms = 0
+        final_mapping_quality = mapping_quality
+
+        if self.japanese_mapper:
+            try:
+                # Detailed device mapping analysis with consistent results
+                mapping_analysis = self._analyze_device_mapping_quality(query)
+                total_device_terms = mapping_analysis.total_device_terms
+
+                if total_device_terms > 0:
+                    # Deterministic weight calculation for direct vs fuzzy mappings
+                    weighted_mapping_quality = (
+                        mapping_analysis.direct_mappings * 1.0 + mapping_analysis.fuzzy_mappings * 0.7
+                    ) / total_device_terms
+                    # Apply fuzzy matching confidence factor deterministically
+                    final_mapping_quality = min(weighted_mapping_quality * fuzzy_confidence, 1.0)
+
+            except Exception as e:
+                logger.debug(f"Error in advanced Japanese mapping quality assessment: {e}")
+                # Use fallback deterministic value
+                total_device_terms = 0
+                final_mapping_quality = 0.8
+
+        return QueryAnalysis(
+            is_japanese=True,
+            japanese_ratio=self._calculate_japanese_ratio(query),
+            mapping_quality=mapping_quality,
+            fuzzy_confidence=fuzzy_confidence,
+            total_device_terms=total_device_terms,
+            final_mapping_quality=final_mapping_quality,
+            is_mixed_language=self._is_mixed_language_query(query),
+        )
+
     def _is_japanese_query(self, query: str) -> bool:
         """
         Check if query contains Japanese characters.
@@ -975,24 +1599,7 @@ class RepairGuideService:
         Returns:
             True if query contains Japanese characters
         """
-        if not query:
-            return False
-
-        # Check for Japanese character ranges
-        japanese_ranges = [
-            (0x3040, 0x309F),  # Hiragana
-            (0x30A0, 0x30FF),  # Katakana
-            (0x4E00, 0x9FAF),  # CJK Unified Ideographs (Kanji)
-            (0xFF66, 0xFF9D),  # Half-width Katakana
-        ]
-
-        for char in query:
-            char_code = ord(char)
-            for start, end in japanese_ranges:
-                if start <= char_code <= end:
-                    return True
-
-        return False
+        return _contains_japanese(query)
 
     def _calculate_japanese_ratio(self, query: str) -> float:
         """
@@ -1004,31 +1611,12 @@ class RepairGuideService:
         Returns:
             Ratio of Japanese characters (0.0 to 1.0)
         """
-        if not query:
+        if not query or query.isascii():
             return 0.0
 
-        # Japanese character ranges
-        japanese_ranges = [
-            (0x3040, 0x309F),  # Hiragana
-            (0x30A0, 0x30FF),  # Katakana
-            (0x4E00, 0x9FAF),  # CJK Unified Ideographs (Kanji)
-            (0xFF66, 0xFF9D),  # Half-width Katakana
-        ]
-
-        japanese_char_count = 0
-        total_char_count = 0
-
-        for char in query:
-            if char.isspace():
-                continue  # Skip whitespace
-
-            total_char_count += 1
-            char_code = ord(char)
-
-            for start, end in japanese_ranges:
-                if start <= char_code <= end:
-                    japanese_char_count += 1
-                    break
+        # Whitespace is not counted; re's \s matches exactly the str.isspace() characters
+        total_char_count = len(query) - len(_WHITESPACE_RE.findall(query))
+        japanese_char_count = len(_JAPANESE_CHAR_RE.findall(query))
 
         if total_char_count == 0:
             return 0.0
@@ -1049,9 +1637,7 @@ class RepairGuideService:
             return 1.0  # Default quality if no Japanese support
 
         try:
-            import re
-
-            words = re.split(r"[\s\u3000]+", query.strip())
+            words = query.split()
 
             total_japanese_device_words = 0
             successful_mappings = 0
@@ -1062,14 +1648,14 @@ class RepairGuideService:
 
                 # Check if this word contains Japanese characters and could be a device name
                 if self._is_japanese_query(word):
-                    # Check if it's a potential device name
-                    if self.japanese_mapper.is_device_name(word):
+                    # A direct mapping already proves it's a device name, so only unmapped words
+                    # need the keyword check
+                    mapped_device = self.japanese_mapper.map_device_name(word)
+                    if mapped_device:
+                        total_japanese_device_words += 1
+                        successful_mappings += 1
+                    elif self.japanese_mapper.is_device_name(word):
                         total_japanese_device_words += 1
-
-                        # Check if mapping is successful
-                        mapped_device = self.japanese_mapper.map_device_name(word)
-                        if mapped_device:
-                            successful_mappings += 1
 
             if total_japanese_device_words == 0:
                 return 1.0  # No Japanese device words to map
@@ -1094,9 +1680,7 @@ class RepairGuideService:
             return 1.0
 
         try:
-            import re
-
-            words = re.split(r"[\s\u3000]+", query.strip())
+            words = query.split()
 
             fuzzy_confidences = []
 
@@ -1120,7 +1704,7 @@ class RepairGuideService:
             logger.debug(f"Error evaluating fuzzy matching confidence: {e}")
             return 0.7  # Conservative default
 
-    def _analyze_device_mapping_quality(self, query: str) -> Dict[str, int]:
+    def _analyze_device_mapping_quality(self, query: str) -> MappingAnalysis:
         """
         Analyze the quality of device mappings in a Japanese query.
 
@@ -1128,44 +1712,42 @@ class RepairGuideService:
             query: Search query to analyze
 
         Returns:
-            Dictionary with mapping analysis results
+            MappingAnalysis with mapping analysis results
         """
-        analysis = {"direct_mappings": 0, "fuzzy_mappings": 0, "total_device_terms": 0, "unmapped_terms": 0}
-
         if not self.japanese_mapper or not query:
-            return analysis
+            return MappingAnalysis()
 
-        try:
-            import re
+        direct_mappings = fuzzy_mappings = total_device_terms = unmapped_terms = 0
 
-            words = re.split(r"[\s\u3000]+", query.strip())
+        try:
+            words = query.split()
 
             for word in words:
                 if not word or not self._is_japanese_query(word):
                     continue
 
+                # Try direct mapping first; a mapped word is always a device term
+                direct_mapping = self.japanese_mapper.map_device_name(word)
+                if direct_mapping:
+                    total_device_terms += 1
+                    direct_mappings += 1
+                    continue
+
                 # Check if it's a potential device term
                 if self.japanese_mapper.is_device_name(word):
-                    analysis["total_device_terms"] += 1
-
-                    # Try direct mapping first
-                    direct_mapping = self.japanese_mapper.map_device_name(word)
-                    if direct_mapping:
-                        analysis["direct_mappings"] += 1
-                        continue
+                    total_device_terms += 1
 
                     # Try fuzzy mapping
                     fuzzy_result = self.japanese_mapper.find_best_match(word, threshold=0.7)
                     if fuzzy_result:
-                        analysis["fuzzy_mappings"] += 1
+                        fuzzy_mappings += 1
                     else:
-                        analysis["unmapped_terms"] += 1
-
-            return analysis
+                        unmapped_terms += 1
 
         except Exception as e:
             logger.debug(f"Error analyzing device mapping quality: {e}")
-            return analysis
+
+        return MappingAnalysis(direct_mappings, fuzzy_mappings, total_device_terms, unmapped_terms)
 
     def _is_mixed_language_query(self, query: str) -> bool:
         """
@@ -1203,19 +1785,7 @@ class RepairGuideService:
         Returns:
             True if character is Japanese
         """
-        char_code = ord(char)
-        japanese_ranges = [
-            (0x3040, 0x309F),  # Hiragana
-            (0x30A0, 0x30FF),  # Katakana
-            (0x4E00, 0x9FAF),  # CJK Unified Ideographs (Kanji)
-            (0xFF66, 0xFF9D),  # Half-width Katakana
-        ]
-
-        for start, end in japanese_ranges:
-            if start <= char_code <= end:
-                return True
-
-        return False
+        return _is_japanese_code_point(ord(char))
 
     def _is_similar_difficulty(self, guide_difficulty: str, target_difficulty: str) -> bool:
         """
@@ -1228,52 +1798,23 @@ class RepairGuideService:
         Returns:
             True if difficulty levels are similar
         """
-        # Define difficulty similarity groups
-        difficulty_groups = [
-            ["easy", "beginner"],
-            ["moderate", "intermediate"],
-            ["difficult", "expert", "very difficult"],
-        ]
-
-        guide_lower = guide_difficulty.lower()
-        target_lower = target_difficulty.lower()
-
         # Check if both difficulties are in the same group
-        for group in difficulty_groups:
-            if guide_lower in group and target_lower in group:
-                return True
-
-        return False
+        return _same_difficulty_group(guide_difficulty.lower(), target_difficulty.lower())
 
-    def _explain_difficulty(self, difficulty: str) -> str:
+    def _explain_difficulty(self, difficulty: str, difficulty_lower: Optional[str] = None) -> str:
         """Provide explanation for difficulty level"""
-        explanations = {
-            "easy": "Can be completed by beginners with basic tools. Low risk of damage.",
-            "moderate": "Requires some technical knowledge and specialized tools. Moderate risk.",
-            "difficult": (
-                "Advanced repair requiring significant expertise and specialized equipment. "
-                "High risk of damage if done incorrectly."
-            ),
-            "very difficult": (
-                "Expert-level repair. Consider professional service unless you have extensive experience."
-            ),
-        }
-
-        return explanations.get(difficulty.lower(), f"Difficulty level: {difficulty}")
+        if difficulty_lower is None:
+            difficulty_lower = difficulty.lower()
+        explanation = _DIFF_TABLE.get(difficulty_lower, _DEFAULT_DIFF_PROFILE)[0]
+        return explanation or f"Difficulty level: {difficulty}"
 
-    def _estimate_repair_cost(self, guide: Guide) -> str:
+    def _estimate_repair_cost(self, guide: Guide, difficulty_lower: Optional[str] = None) -> str:
         """Estimate repair cost range"""
+        if difficulty_lower is None:
+            difficulty_lower = guide.difficulty.lower()
+
         # Simple heuristic based on parts and difficulty
-        base_cost = 10
-
-        if guide.difficulty.lower() == "easy":
-            base_cost += 20
-        elif guide.difficulty.lower() == "moderate":
-            base_cost += 50
-        elif guide.difficulty.lower() == "difficult":
-            base_cost += 100
-        else:
-            base_cost += 200
+        base_cost = 10 + _DIFF_TABLE.get(difficulty_lower, _DEFAULT_DIFF_PROFILE)[1]
 
         # Add cost for parts (rough estimate)
         parts_cost = len(guide.parts) * 15
@@ -1281,19 +1822,13 @@ class RepairGuideService:
         total = base_cost + parts_cost
         return f"${total//2}-${total*2}"  # Range estimate
 
-    def _estimate_success_rate(self, guide: Guide) -> float:
+    def _estimate_success_rate(self, guide: Guide, difficulty_lower: Optional[str] = None) -> float:
         """Estimate success rate based on difficulty and completeness"""
-        base_rate = 0.7
+        if difficulty_lower is None:
+            difficulty_lower = guide.difficulty.lower()
 
         # Adjust for difficulty
-        if guide.difficulty.lower() == "easy":
-            base_rate = 0.9
-        elif guide.difficulty.lower() == "moderate":
-            base_rate = 0.75
-        elif guide.difficulty.lower() == "difficult":
-            base_rate = 0.6
-        else:
-            base_rate = 0.4
+        base_rate = _DIFF_TABLE.get(difficulty_lower, _DEFAULT_DIFF_PROFILE)[2]
 
         # Adjust for completeness
         if guide.tools and guide.parts:
@@ -1305,16 +1840,28 @@ class RepairGuideService:
 
     async def _enhance_with_related_guides(self, results: List[RepairGuideResult]):
         """Enhance results with related guides"""
+        # Find related guides based on device, searching each distinct device once and concurrently
+        devices = list(dict.fromkeys(result.guide.device for result in results if result.guide.device))
+        if not devices:
+            return
+
+        # Don't enhance the related results themselves, or a cache that never hits recurses forever
+        related_results = await asyncio.gather(
+            *(self.search_guides(device, limit=3, use_cache=True, enhance_related=False) for device in devices),
+            return_exceptions=True,
+        )
+        related_by_device = dict(zip(devices, related_results))
+
         for result in results:
-            try:
-                # Find related guides based on device
-                if result.guide.device:
-                    related_guides = await self.search_guides(result.guide.device, limit=3, use_cache=True)
-                    # Filter out the current guide and get top 2
-                    related = [r.guide for r in related_guides if r.guide.guideid != result.guide.guideid][:2]
-                    result.related_guides = related
-            except Exception as e:
-                logger.warning(f"Failed to get related guides: {e}")
+            if not result.guide.device:
+                continue
+            related_guides = related_by_device[result.guide.device]
+            if isinstance(related_guides, Exception):
+                logger.warning(f"Failed to get related guides: {related_guides}")
+                continue
+            # Filter out the current guide and get top 2
+            related = [r.guide for r in related_guides if r.guide.guideid != result.guide.guideid][:2]
+            result.related_guides = related
 
     def _preprocess_japanese_query(self, query: str) -> str:
         """
@@ -1338,10 +1885,9 @@ class RepairGuideService:
         logger.debug(f"Preprocessing Japanese query: {query}")
 
         try:
-            # Split query into words for processing
-            import re
-
-            words = re.split(r"[\s\u3000]+", query.strip())  # Split on spaces and full-width spaces
+            # Split query into words for processing; str.split() treats full-width spaces
+            # (U+3000) as whitespace, like every other Unicode space
+            words = query.split()
             processed_words = []
 
             for word in words:
@@ -1381,28 +1927,38 @@ class RepairGuideService:
 
     def _create_search_cache_key(self, query: str, filters: SearchFilters, limit: int) -> str:
         """Create cache key for search results"""
-        filter_str = f"{filters.device_type}_{filters.difficulty_level}_{filters.category}"
-        key = f"search_{query}_{filter_str}_{limit}"
-        return hashlib.sha256(key.encode()).hexdigest()
+        # attrgetter/getattr rather than asdict(): faster, and the API layer may pass its pydantic
+        # filter model, which lacks some SearchFilters fields. Tuples and lists serialize alike,
+        # so both paths produce the same key.
+        if type(filters) is SearchFilters:
+            filter_values = _search_filter_values(filters)
+        else:
+            filter_values = [getattr(filters, name, None) for name in _SEARCH_FILTER_FIELDS]
+        return _cache_digest((query, filter_values, limit))
 
 
 # Global service instance
 _repair_guide_service: Optional[RepairGuideService] = None
+_repair_guide_service_lock = threading.Lock()
 
 
 def get_repair_guide_service() -> RepairGuideService:
     """Get global repair guide service instance"""
     global _repair_guide_service
     if _repair_guide_service is None:
-        _repair_guide_service = RepairGuideService(
-            ifixit_api_key=os.getenv("IFIXIT_API_KEY"),
-            redis_url=os.getenv("REDIS_URL"),
-            enable_japanese_support=True,
-        )
+        # Double-checked so concurrent first calls don't build two services (and two Redis pools)
+        with _repair_guide_service_lock:
+            if _repair_guide_service is None:
+                _repair_guide_service = RepairGuideService(
+                    ifixit_api_key=os.getenv("IFIXIT_API_KEY"),
+                    redis_url=os.getenv("REDIS_URL"),
+                    enable_japanese_support=True,
+                )
     return _repair_guide_service
 
 
 def reset_repair_guide_service():
     """Reset global service instance (for testing)"""
     global _repair_guide_service
-    _repair_guide_service = None
+    with _repair_guide_service_lock:
+        _repair_guide_service = None
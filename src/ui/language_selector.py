@@ -2,9 +2,16 @@
 Language selector component for RepairGPT
 """
 
+from typing import List, Tuple
+
 import streamlit as st
 
-from i18n import i18n
+from i18n import _, i18n
+
+# Selectable languages, built once rather than on every Streamlit rerun
+_LANGUAGES = {"en": "English 🇺🇸", "ja": "日本語 🇯🇵"}
+_LANGUAGE_KEYS = tuple(_LANGUAGES)
+_LANGUAGE_INDEX = {language: index for index, language in enumerate(_LANGUAGE_KEYS)}
 
 
 def language_selector():
@@ -14,15 +21,13 @@ def language_selector():
     st.sidebar.markdown("---")
 
     # Language selection
-    languages = {"en": "English 🇺🇸", "ja": "日本語 🇯🇵"}
-
     current_language = st.session_state.get("language", "en")
 
     selected_language = st.sidebar.selectbox(
         "🌐 Language / 言語",
-        options=list(languages.keys()),
-        format_func=lambda x: languages[x],
-        index=list(languages.keys()).index(current_language),
+        options=_LANGUAGE_KEYS,
+        format_func=_LANGUAGES.__getitem__,
+        index=_LANGUAGE_INDEX[current_language],
         key="language_selector",
     )
 
@@ -35,42 +40,51 @@ def language_selector():
     return selected_language
 
 
+# Translation keys of the sidebar selectors, in display order
+_DEVICE_CATEGORY_KEYS = (
+    "ui.placeholders.select_device",
+    "devices.nintendo_switch",
+    "devices.nintendo_switch_lite",
+    "devices.nintendo_switch_oled",
+    "devices.iphone",
+    "devices.ipad",
+    "devices.macbook",
+    "devices.imac",
+    "devices.playstation_5",
+    "devices.playstation_4",
+    "devices.xbox_series",
+    "devices.xbox_one",
+    "devices.samsung_galaxy",
+    "devices.google_pixel",
+    "devices.gaming_pc",
+    "devices.laptop",
+    "devices.desktop_pc",
+    "devices.other",
+)
+_SKILL_LEVEL_KEYS = (
+    "skill_levels.beginner",
+    "skill_levels.intermediate",
+    "skill_levels.expert",
+)
+
+
+def _translate_keys(keys: Tuple[str, ...]) -> List[str]:
+    """
+    Translate keys in the active language; i18n memoizes each lookup per language
+    and clears that cache on reload_translations, so labels are never stale
+    """
+    return [_(key) for key in keys]
+
+
 def get_localized_device_categories():
     """
     Get device categories in the current language
     """
-    from i18n import _
-
-    return [
-        _("ui.placeholders.select_device"),
-        _("devices.nintendo_switch"),
-        _("devices.nintendo_switch_lite"),
-        _("devices.nintendo_switch_oled"),
-        _("devices.iphone"),
-        _("devices.ipad"),
-        _("devices.macbook"),
-        _("devices.imac"),
-        _("devices.playstation_5"),
-        _("devices.playstation_4"),
-        _("devices.xbox_series"),
-        _("devices.xbox_one"),
-        _("devices.samsung_galaxy"),
-        _("devices.google_pixel"),
-        _("devices.gaming_pc"),
-        _("devices.laptop"),
-        _("devices.desktop_pc"),
-        _("devices.other"),
-    ]
+    return _translate_keys(_DEVICE_CATEGORY_KEYS)
 
 
 def get_localized_skill_levels():
     """
     Get skill levels in the current language
     """
-    from i18n import _
-
-    return [
-        _("skill_levels.beginner"),
-        _("skill_levels.intermediate"),
-        _("skill_levels.expert"),
-    ]
+    return _translate_keys(_SKILL_LEVEL_KEYS)
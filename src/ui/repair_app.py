@@ -5,27 +5,28 @@ Enhanced with Issue #90: 🔒 設定管理とセキュリティ強化
 Enhanced with Issue #89: レスポンシブデザインとUI/UX改善
 """
 
+import asyncio
+import functools
+import io
 import os
+import re
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 
 # Add src directory to path for imports FIRST
 current_dir = Path(__file__).parent
 src_root = current_dir.parent
-sys.path.insert(0, str(src_root))
+# Streamlit re-executes this script on every rerun, so only add the path once
+if str(src_root) not in sys.path:
+    sys.path.insert(0, str(src_root))
 
 import requests
 import streamlit as st
-from PIL import Image
+from requests.adapters import HTTPAdapter
 
-from services.repair_guide_service import (
-    RepairGuideResult,
-    RepairGuideService,
-    SearchFilters,
-    get_repair_guide_service,
-)
 from utils.japanese_device_mapper import (
     find_device_match,
     get_mapper,
@@ -40,6 +41,9 @@ from utils.logger import (
     log_user_action,
 )
 
+if TYPE_CHECKING:
+    from services.repair_guide_service import RepairGuideResult
+
 # Conditional imports with fallbacks to prevent circular dependencies
 try:
     from config.settings import settings
@@ -56,11 +60,6 @@ except ImportError:
         enable_security_headers = True
     settings = FallbackSettings()
 
-try:
-    from data.offline_repair_database import OfflineRepairDatabase
-except ImportError:
-    OfflineRepairDatabase = None
-
 try:
     from utils.security import mask_sensitive_data, sanitize_input
 except ImportError:
@@ -71,7 +70,10 @@ except ImportError:
 
 try:
     from i18n import _, i18n
+
+    I18N_AVAILABLE = True
 except ImportError:
+    I18N_AVAILABLE = False
     def _(key, **kwargs):
         return key.format(**kwargs) if kwargs else key
     class MockI18n:
@@ -143,8 +145,68 @@ logger = get_logger(__name__)
 API_BASE_URL = os.getenv("FASTAPI_BASE_URL", "http://localhost:8000")
 API_TIMEOUT = 30
 
+# Longest edge of the uploaded image preview, in pixels
+PREVIEW_MAX_SIZE = 1024
+
+# Severity badge shown next to diagnosis results
+SEVERITY_ICONS = {
+    "LOW": "🟢",
+    "MEDIUM": "🟡",
+    "HIGH": "🔴",
+}
+
+# Search queries are split on ASCII and full-width (U+3000) whitespace
+JAPANESE_QUERY_SPLIT_RE = re.compile(r"[\s\u3000]+")
+
+
+@st.cache_resource
+def get_api_session() -> requests.Session:
+    """HTTP session shared by all sessions so API calls reuse keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_async_event_loop() -> asyncio.AbstractEventLoop:
+    """Background event loop shared by all sessions for async service calls"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="repairgpt-async-loop", daemon=True).start()
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the shared background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_async_event_loop()).result()
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=256)
+def cached_guide_search(
+    query: str,
+    device_type: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    category: Optional[str] = None,
+    language: str = "en",
+    limit: int = 8,
+) -> List["RepairGuideResult"]:
+    """Search repair guides, memoized on the query and filters so unrelated reruns don't search again"""
+    # Imported on first search so sessions that never open the guide panel skip loading the service stack
+    from services.repair_guide_service import SearchFilters, get_repair_guide_service
+
+    search_filters = SearchFilters(
+        device_type=device_type,
+        difficulty_level=difficulty,
+        category=category,
+        language=language,
+    )
+    return run_async(get_repair_guide_service().search_guides(query=query, filters=search_filters, limit=limit))
+
 
 # Japanese search functionality
+# Every widget change reruns the script with the same query, so the mapping work is memoized per query
+@functools.lru_cache(maxsize=1024)
 def preprocess_japanese_search_query(query: str) -> str:
     """
     Preprocess Japanese search query to enhance search results.
@@ -162,9 +224,7 @@ def preprocess_japanese_search_query(query: str) -> str:
         japanese_mapper = get_mapper()
 
         # Split query into words for processing
-        import re
-
-        words = re.split(r"[\s\u3000]+", query.strip())  # Split on spaces and full-width spaces
+        words = JAPANESE_QUERY_SPLIT_RE.split(query.strip())
         processed_words = []
 
         for word in words:
@@ -200,6 +260,25 @@ def preprocess_japanese_search_query(query: str) -> str:
         return query
 
 
+# Common Japanese queries offered by the suggestions button
+JAPANESE_SEARCH_SUGGESTIONS = (
+    "スイッチ 画面割れ",
+    "アイフォン バッテリー交換",
+    "ノートパソコン 電源が入らない",
+    "プレステ5 冷却ファン",
+    "Joy-Con ドリフト",
+    "マックブック キーボード修理",
+    "iPad 充電できない",
+    "スマホ 水没修理",
+    "ゲーム機 読み込みエラー",
+    "ヘッドフォン 音が出ない",
+)
+
+
+# First entry of the suggestion picker, meaning nothing has been picked yet
+SUGGESTION_PLACEHOLDER = "Select suggestion..."
+
+
 def get_japanese_search_suggestions() -> List[str]:
     """
     Get commonly used Japanese search queries for suggestions.
@@ -207,18 +286,31 @@ def get_japanese_search_suggestions() -> List[str]:
     Returns:
         List of Japanese search query suggestions
     """
-    return [
-        "スイッチ 画面割れ",
-        "アイフォン バッテリー交換",
-        "ノートパソコン 電源が入らない",
-        "プレステ5 冷却ファン",
-        "Joy-Con ドリフト",
-        "マックブック キーボード修理",
-        "iPad 充電できない",
-        "スマホ 水没修理",
-        "ゲーム機 読み込みエラー",
-        "ヘッドフォン 音が出ない",
-    ]
+    return list(JAPANESE_SEARCH_SUGGESTIONS)
+
+
+# Japanese difficulty mappings
+JAPANESE_DIFFICULTY_MAP = {
+    "初心者": "beginner",
+    "中級者": "intermediate",
+    "上級者": "expert",
+    "簡単": "easy",
+    "普通": "moderate",
+    "難しい": "difficult",
+}
+
+# Japanese category mappings
+JAPANESE_CATEGORY_MAP = {
+    "画面修理": "screen repair",
+    "バッテリー交換": "battery replacement",
+    "基板修理": "motherboard repair",
+    "充電器修理": "charger repair",
+    "ボタン修理": "button repair",
+    "スピーカー修理": "speaker repair",
+    "カメラ修理": "camera repair",
+    "キーボード修理": "keyboard repair",
+    "水没修理": "water damage repair",
+}
 
 
 def normalize_japanese_filter_values(filters: Dict[str, str]) -> Dict[str, str]:
@@ -231,38 +323,23 @@ def normalize_japanese_filter_values(filters: Dict[str, str]) -> Dict[str, str]:
     Returns:
         Dictionary with normalized filter values
     """
-    normalized = filters.copy()
-
-    # Japanese difficulty mappings
-    japanese_difficulty_map = {
-        "初心者": "beginner",
-        "中級者": "intermediate",
-        "上級者": "expert",
-        "簡単": "easy",
-        "普通": "moderate",
-        "難しい": "difficult",
-    }
+    return dict(_normalize_japanese_filter_items(tuple(sorted(filters.items()))))
 
-    # Japanese category mappings
-    japanese_category_map = {
-        "画面修理": "screen repair",
-        "バッテリー交換": "battery replacement",
-        "基板修理": "motherboard repair",
-        "充電器修理": "charger repair",
-        "ボタン修理": "button repair",
-        "スピーカー修理": "speaker repair",
-        "カメラ修理": "camera repair",
-        "キーボード修理": "keyboard repair",
-        "水没修理": "water damage repair",
-    }
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_japanese_filter_items(
+    items: Tuple[Tuple[str, Optional[str]], ...],
+) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Memoized body of normalize_japanese_filter_values, keyed on the sorted filter items"""
+    normalized = dict(items)
 
     # Normalize difficulty
-    if "difficulty" in normalized and normalized["difficulty"] in japanese_difficulty_map:
-        normalized["difficulty"] = japanese_difficulty_map[normalized["difficulty"]]
+    if "difficulty" in normalized and normalized["difficulty"] in JAPANESE_DIFFICULTY_MAP:
+        normalized["difficulty"] = JAPANESE_DIFFICULTY_MAP[normalized["difficulty"]]
 
     # Normalize category
-    if "category" in normalized and normalized["category"] in japanese_category_map:
-        normalized["category"] = japanese_category_map[normalized["category"]]
+    if "category" in normalized and normalized["category"] in JAPANESE_CATEGORY_MAP:
+        normalized["category"] = JAPANESE_CATEGORY_MAP[normalized["category"]]
 
     # Normalize device type using Japanese mapper
     if "device_type" in normalized and normalized["device_type"]:
@@ -270,64 +347,135 @@ def normalize_japanese_filter_values(filters: Dict[str, str]) -> Dict[str, str]:
         if mapped_device:
             normalized["device_type"] = mapped_device
 
-    return normalized
+    return tuple(normalized.items())
+
+
+# Hardcoded translations to avoid any i18n issues
+SAFE_TRANSLATIONS: Dict[str, str] = {
+    "api.health_warning": "⚠️ API server is not running. Some features may be limited. Start the API server with: python3 src/api/main.py",
+    "app.title": "RepairGPT - AI Repair Assistant",
+    "app.tagline": "AI-Powered Electronic Device Repair Assistant",
+    "sidebar.device_config": "Device Configuration",
+    "sidebar.device_type": "Device Type",
+    "sidebar.device_model": "Device Model",
+    "sidebar.device_model_help": "Enter your device model for more specific guidance",
+    "sidebar.issue_description": "Issue Description",
+    "sidebar.issue_description_help": "Describe the problem you're experiencing",
+    "sidebar.skill_level": "Skill Level",
+    "chat.title": "💬 Chat with RepairGPT",
+    "chat.input_placeholder": "Describe your repair issue or ask a question...",
+    "chat.thinking": "RepairGPT is thinking...",
+    "chat.clear_history": "Clear Chat History",
+    # Japanese search functionality translations
+    "search.title": "🔍 Smart Search",
+    "search.japanese_input": "Japanese Search Input",
+    "search.input_placeholder": "Enter device and issue (supports Japanese)",
+    "search.input_placeholder_japanese": "例: スイッチ 画面割れ",
+    "search.suggestions": "Search Suggestions",
+    "search.filters": "Search Filters",
+    "search.difficulty": "Difficulty Level",
+    "search.category": "Repair Category",
+    "search.device_filter": "Device Type Filter",
+    "search.searching": "Searching repair guides...",
+    "search.results_found": "Found {count} repair guides",
+    "search.no_results": "No repair guides found",
+    "search.error": "Search error occurred",
+    "search.mapping_quality": "Mapping Quality",
+    "search.confidence": "Confidence",
+    "search.source": "Source",
+    "search.last_updated": "Last Updated",
+    "search.processing_time": "Processing Time",
+    "search.history": "Search History",
+    "search.bookmarks": "Bookmarks",
+    "search.clear_history": "Clear History",
+    "search.save_bookmark": "Save Bookmark",
+    "search.remove_bookmark": "Remove Bookmark",
+}
 
 
 # Safe translation function with hardcoded fallbacks
 def safe_translate(key: str, fallback: str = "") -> str:
     """安全な翻訳関数（フォールバック付き）"""
-    # Hardcoded translations to avoid any i18n issues
-    translations = {
-        "api.health_warning": "⚠️ API server is not running. Some features may be limited. Start the API server with: python3 src/api/main.py",
-        "app.title": "RepairGPT - AI Repair Assistant",
-        "app.tagline": "AI-Powered Electronic Device Repair Assistant",
-        "sidebar.device_config": "Device Configuration",
-        "sidebar.device_type": "Device Type",
-        "sidebar.device_model": "Device Model",
-        "sidebar.device_model_help": "Enter your device model for more specific guidance",
-        "sidebar.issue_description": "Issue Description",
-        "sidebar.issue_description_help": "Describe the problem you're experiencing",
-        "sidebar.skill_level": "Skill Level",
-        "chat.title": "💬 Chat with RepairGPT",
-        "chat.input_placeholder": "Describe your repair issue or ask a question...",
-        "chat.thinking": "RepairGPT is thinking...",
-        "chat.clear_history": "Clear Chat History",
-        # Japanese search functionality translations
-        "search.title": "🔍 Smart Search",
-        "search.japanese_input": "Japanese Search Input",
-        "search.input_placeholder": "Enter device and issue (supports Japanese)",
-        "search.input_placeholder_japanese": "例: スイッチ 画面割れ",
-        "search.suggestions": "Search Suggestions",
-        "search.filters": "Search Filters",
-        "search.difficulty": "Difficulty Level",
-        "search.category": "Repair Category",
-        "search.device_filter": "Device Type Filter",
-        "search.searching": "Searching repair guides...",
-        "search.results_found": "Found {count} repair guides",
-        "search.no_results": "No repair guides found",
-        "search.error": "Search error occurred",
-        "search.mapping_quality": "Mapping Quality",
-        "search.confidence": "Confidence",
-        "search.source": "Source",
-        "search.last_updated": "Last Updated",
-        "search.processing_time": "Processing Time",
-        "search.history": "Search History",
-        "search.bookmarks": "Bookmarks",
-        "search.clear_history": "Clear History",
-        "search.save_bookmark": "Save Bookmark",
-        "search.remove_bookmark": "Remove Bookmark",
-    }
-
-    if key in translations:
-        return translations[key]
+    translation = SAFE_TRANSLATIONS.get(key)
+    if translation is not None:
+        return translation
 
     # Try original i18n system as backup
+    if I18N_AVAILABLE:
+        try:
+            return _(key)
+        except Exception:
+            pass
+    return fallback or key
+
+
+def build_chat_payload(message: str, device_context: Dict = None) -> Dict:
+    """Build the sanitized request body for the chat endpoints"""
+    # Sanitize input message
+    safe_message = sanitize_input(message, max_length=settings.max_text_length)
+
+    payload = {"message": safe_message, "language": st.session_state.language}
+
+    # Add device context if available
+    if device_context:
+        payload.update(
+            {
+                "device_type": device_context.get("device_type"),
+                "device_model": (
+                    sanitize_input(device_context.get("device_model", ""), max_length=100)
+                    if device_context.get("device_model")
+                    else None
+                ),
+                "issue_description": (
+                    sanitize_input(device_context.get("issue_description", ""), max_length=500)
+                    if device_context.get("issue_description")
+                    else None
+                ),
+                "skill_level": device_context.get("skill_level", "beginner"),
+            }
+        )
+
+    return payload
+
+
+def stream_chat_api(message: str, device_context: Dict = None) -> Iterator[str]:
+    """Stream the chat response as it is generated, falling back to call_chat_api if streaming is unavailable"""
+    streamed = False
+
     try:
-        from i18n import _
+        payload = build_chat_payload(message, device_context)
 
-        return _(key)
-    except:
-        return fallback or key
+        log_api_call(
+            logger,
+            f"{settings.api_prefix}/chat/stream",
+            "POST",
+            language=st.session_state.language,
+            message_length=len(payload["message"]),
+        )
+
+        with get_api_session().post(
+            f"{API_BASE_URL}{settings.api_prefix}/chat/stream",
+            json=payload,
+            timeout=API_TIMEOUT,
+            headers={"Accept-Language": st.session_state.language},
+            stream=True,
+        ) as response:
+            if response.status_code == 200:
+                for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                    if chunk:
+                        streamed = True
+                        yield chunk
+                return
+
+            logger.warning(f"Chat stream unavailable (status {response.status_code}), using blocking call")
+
+    except Exception as e:
+        log_api_error(logger, f"{settings.api_prefix}/chat/stream", e, streamed=streamed)
+        if streamed:
+            # Keep the partial response rather than appending a second, unrelated answer
+            return
+
+    yield call_chat_api(message, device_context)
 
 
 def call_chat_api(message: str, device_context: Dict = None) -> str:
@@ -343,29 +491,8 @@ def call_chat_api(message: str, device_context: Dict = None) -> str:
     )
 
     try:
-        # Sanitize input message
-        safe_message = sanitize_input(message, max_length=settings.max_text_length)
-
-        payload = {"message": safe_message, "language": st.session_state.language}
-
-        # Add device context if available
-        if device_context:
-            payload.update(
-                {
-                    "device_type": device_context.get("device_type"),
-                    "device_model": (
-                        sanitize_input(device_context.get("device_model", ""), max_length=100)
-                        if device_context.get("device_model")
-                        else None
-                    ),
-                    "issue_description": (
-                        sanitize_input(device_context.get("issue_description", ""), max_length=500)
-                        if device_context.get("issue_description")
-                        else None
-                    ),
-                    "skill_level": device_context.get("skill_level", "beginner"),
-                }
-            )
+        payload = build_chat_payload(message, device_context)
+        safe_message = payload["message"]
 
         # Log API call
         log_api_call(
@@ -376,7 +503,7 @@ def call_chat_api(message: str, device_context: Dict = None) -> str:
             message_length=len(safe_message),
         )
 
-        response = requests.post(
+        response = get_api_session().post(
             f"{API_BASE_URL}{settings.api_prefix}/chat",
             json=payload,
             timeout=API_TIMEOUT,
@@ -502,7 +629,7 @@ def call_diagnose_api(
             symptoms_count=len(symptoms) if symptoms else 0,
         )
 
-        response = requests.post(
+        response = get_api_session().post(
             f"{API_BASE_URL}{settings.api_prefix}/diagnose",
             json=payload,
             timeout=API_TIMEOUT,
@@ -582,12 +709,14 @@ def call_diagnose_api(
         return None
 
 
+# Probed on every rerun, so the result (and its log line) is reused for 30 seconds
+@st.cache_data(ttl=30, show_spinner=False)
 def check_api_health() -> bool:
     """Check if the FastAPI server is running"""
     try:
         start_time = time.time()
         # Use the correct /health endpoint (not /api/v1/health)
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = get_api_session().get(f"{API_BASE_URL}/health", timeout=5)
 
         is_healthy = response.status_code == 200
         duration = time.time() - start_time
@@ -727,6 +856,362 @@ st.markdown(
 )
 
 
+def build_chat_history_html(messages: List[Dict[str, str]]) -> str:
+    """Join the chat transcript into one HTML block (user content is already escaped by sanitize_input)"""
+    return "\n".join(
+        f'<div class="chat-message {"user" if message["role"] == "user" else "bot"}-message">{message["content"]}</div>'
+        for message in messages
+    )
+
+
+def markdown_list(header: str, items: List[str]) -> str:
+    """Render a bold header and its bullet items as one markdown block"""
+    return "\n".join([header, *(f"- {item}" for item in items)])
+
+
+# Guide search filter choices ("All"/"すべて" disables the filter)
+DIFFICULTY_FILTER_OPTIONS_JA = ("すべて", "初心者", "中級者", "上級者")
+DIFFICULTY_FILTER_OPTIONS_EN = ("All", "Beginner", "Intermediate", "Expert")
+CATEGORY_FILTER_OPTIONS_JA = (
+    "すべて",
+    "画面修理",
+    "バッテリー交換",
+    "基板修理",
+    "ボタン修理",
+    "充電器修理",
+    "水没修理",
+)
+CATEGORY_FILTER_OPTIONS_EN = (
+    "All",
+    "Screen Repair",
+    "Battery Replacement",
+    "Motherboard Repair",
+    "Button Repair",
+    "Charger Repair",
+    "Water Damage",
+)
+
+# Shown when a guide search returns nothing
+SEARCH_TIPS_JA = markdown_list(
+    "**検索のコツ:**",
+    [
+        "より一般的な用語を使用してみてください",
+        "デバイス名と問題を分けて検索してみてください",
+        "英語での検索も試してみてください",
+    ],
+)
+SEARCH_TIPS_EN = markdown_list(
+    "**Search Tips:**",
+    [
+        "Try using more general terms",
+        "Search for device and issue separately",
+        "Japanese search is also supported",
+    ],
+)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def encode_preview_image(file_bytes: bytes) -> bytes:
+    """Downscale an uploaded image and encode it as JPEG, cached by upload content"""
+    # Imported here so sessions that never upload an image don't load PIL
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(file_bytes))
+    # JPEGs decode directly at a reduced scale (no-op for other formats)
+    image.draft("RGB", (PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+    image.thumbnail((PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
+# Button callbacks run before the rerun their click triggers, so state changes need no extra st.rerun()
+def toggle_search_bookmark(bookmark_key: str) -> None:
+    """Add or remove a guide bookmark"""
+    bookmarks = st.session_state.search_bookmarks
+    if bookmark_key in bookmarks:
+        bookmarks.remove(bookmark_key)
+    else:
+        bookmarks.append(bookmark_key)
+
+
+def use_search_query(query: str) -> None:
+    """Load a previous query into the search box"""
+    st.session_state.main_search_input = query
+
+
+def toggle_search_suggestions() -> None:
+    """Show or hide the suggestion picker"""
+    st.session_state.show_search_suggestions = not st.session_state.get("show_search_suggestions", False)
+
+
+def use_search_suggestion() -> None:
+    """Load the picked suggestion into the search box and close the picker"""
+    selected = st.session_state.get("suggestion_selector", SUGGESTION_PLACEHOLDER)
+    if selected != SUGGESTION_PLACEHOLDER:
+        st.session_state.main_search_input = selected
+        st.session_state.show_search_suggestions = False
+
+
+def clear_search_history() -> None:
+    """Forget recent searches"""
+    st.session_state.search_history = []
+
+
+# Reruns triggered by widgets inside a fragment only re-execute that fragment (Streamlit >= 1.33)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+@fragment
+def guide_search_section():
+    """Smart guide search with history and bookmarks, isolated from the rest of the page"""
+    st.subheader(safe_translate("search.title", "🔍 Smart Search"))
+
+    # Initialize session state for search features
+    if "search_history" not in st.session_state:
+        st.session_state.search_history = []
+    if "search_bookmarks" not in st.session_state:
+        st.session_state.search_bookmarks = []
+    if "last_search_time" not in st.session_state:
+        st.session_state.last_search_time = None
+
+    # Language-aware search input
+    current_lang = st.session_state.get("language", "en")
+    if current_lang == "ja":
+        placeholder_text = safe_translate("search.input_placeholder_japanese", "例: スイッチ 画面割れ")
+    else:
+        placeholder_text = safe_translate("search.input_placeholder", "Enter device and issue (supports Japanese)")
+
+    # Main search input with enhanced features
+    col_search, col_suggest = st.columns([3, 1])
+
+    with col_search:
+        search_query = st.text_input(
+            safe_translate("search.japanese_input", "Smart Search"),
+            placeholder=placeholder_text,
+            max_chars=200,
+            key="main_search_input",
+        )
+
+    with col_suggest:
+        st.button("💡 Suggestions", key="search_suggestions_btn", on_click=toggle_search_suggestions)
+        if st.session_state.get("show_search_suggestions"):
+            st.selectbox(
+                safe_translate("search.suggestions", "Suggestions"),
+                [SUGGESTION_PLACEHOLDER] + get_japanese_search_suggestions(),
+                key="suggestion_selector",
+                on_change=use_search_suggestion,
+            )
+
+    # Advanced search filters with Japanese support
+    with st.expander(safe_translate("search.filters", "🔧 Advanced Filters")):
+        filter_col1, filter_col2, filter_col3 = st.columns(3)
+
+        with filter_col1:
+            difficulty_options = DIFFICULTY_FILTER_OPTIONS_JA if current_lang == "ja" else DIFFICULTY_FILTER_OPTIONS_EN
+            difficulty_filter = st.selectbox(
+                safe_translate("search.difficulty", "Difficulty"), difficulty_options, key="difficulty_filter"
+            )
+
+        with filter_col2:
+            category_options = CATEGORY_FILTER_OPTIONS_JA if current_lang == "ja" else CATEGORY_FILTER_OPTIONS_EN
+            category_filter = st.selectbox(
+                safe_translate("search.category", "Category"), category_options, key="category_filter"
+            )
+
+        with filter_col3:
+            device_filter = st.selectbox(
+                safe_translate("search.device_filter", "Device Filter"),
+                ["All Devices"] + get_localized_device_categories()[1:],  # Skip "Select device"
+                key="device_filter",
+            )
+
+    # Search execution and results
+    if search_query:
+        start_time = time.time()
+        safe_query = sanitize_input(search_query, max_length=200)
+
+        # Preprocess Japanese query
+        processed_query = preprocess_japanese_search_query(safe_query)
+
+        # Normalize filter values
+        filter_values = {
+            "difficulty": (difficulty_filter if difficulty_filter != "All" and difficulty_filter != "すべて" else None),
+            "category": category_filter if category_filter != "All" and category_filter != "すべて" else None,
+            "device_type": device_filter if device_filter != "All Devices" else None,
+        }
+        normalized_filters = normalize_japanese_filter_values(filter_values)
+
+        with st.spinner(safe_translate("search.searching", "Searching repair guides...")):
+            try:
+                # Perform search using the repair guide service (cached across reruns and sessions)
+                search_results = cached_guide_search(
+                    processed_query,
+                    device_type=normalized_filters.get("device_type"),
+                    difficulty=normalized_filters.get("difficulty"),
+                    category=normalized_filters.get("category"),
+                    language=current_lang,
+                    limit=8,
+                )
+
+                processing_time = time.time() - start_time
+                st.session_state.last_search_time = processing_time
+
+                # Add to search history
+                if search_query not in st.session_state.search_history:
+                    st.session_state.search_history.insert(0, search_query)
+                    # Keep only last 10 searches
+                    st.session_state.search_history = st.session_state.search_history[:10]
+
+                # Display search results with enhanced information
+                if search_results:
+                    # Search metrics
+                    metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
+                    with metrics_col1:
+                        st.metric("Results Found", len(search_results))
+                    with metrics_col2:
+                        avg_confidence = sum(r.confidence_score for r in search_results) / len(search_results)
+                        st.metric("Avg Confidence", f"{avg_confidence:.2f}")
+                    with metrics_col3:
+                        st.metric("Processing Time", f"{processing_time:.2f}s")
+
+                    st.success(
+                        safe_translate("search.results_found", "Found {count} repair guides").format(
+                            count=len(search_results)
+                        )
+                    )
+
+                    # Display results with enhanced layout
+                    for i, result in enumerate(search_results):
+                        guide = result.guide
+
+                        # Create expandable guide section with quality indicators
+                        quality_indicator = (
+                            "🟢" if result.confidence_score > 0.8 else "🟡" if result.confidence_score > 0.6 else "🔴"
+                        )
+                        source_icon = (
+                            "🌐" if result.source == "ifixit" else "💾" if result.source == "offline" else "📋"
+                        )
+
+                        with st.expander(f"{quality_indicator} {source_icon} {guide.title}"):
+                            # Guide metadata
+                            info_col1, info_col2, info_col3 = st.columns(3)
+
+                            with info_col1:
+                                st.markdown(f"**{_('guides.difficulty')}:** {guide.difficulty}")
+                                if hasattr(guide, "time_estimate") and guide.time_estimate:
+                                    st.markdown(f"**Time:** {guide.time_estimate}")
+
+                            with info_col2:
+                                st.markdown(
+                                    f"**{safe_translate('search.confidence', 'Confidence')}:** {result.confidence_score:.2f}"
+                                )
+                                st.markdown(f"**{safe_translate('search.source', 'Source')}:** {result.source.title()}")
+
+                            with info_col3:
+                                if result.estimated_cost:
+                                    st.markdown(f"**Cost Estimate:** {result.estimated_cost}")
+                                if result.success_rate:
+                                    st.markdown(f"**Success Rate:** {result.success_rate:.0%}")
+
+                            # Guide content
+                            if guide.summary:
+                                st.markdown(f"**{_('guides.summary')}:** {guide.summary}")
+
+                            if result.difficulty_explanation:
+                                st.info(f"💡 {result.difficulty_explanation}")
+
+                            # Tools and parts
+                            if hasattr(guide, "tools_required") and guide.tools_required:
+                                st.markdown(markdown_list(f"**{_('guides.tools_required')}:**", guide.tools_required))
+
+                            if hasattr(guide, "parts") and guide.parts:
+                                st.markdown(markdown_list("**Parts Required:**", guide.parts))
+
+                            # Warnings
+                            if hasattr(guide, "warnings") and guide.warnings:
+                                for warning in guide.warnings:
+                                    st.warning(f"⚠️ {warning}")
+
+                            # Bookmark functionality
+                            bookmark_col1, bookmark_col2 = st.columns([3, 1])
+                            with bookmark_col2:
+                                bookmark_key = f"{guide.guideid}_{guide.title[:20]}"
+                                if bookmark_key in st.session_state.search_bookmarks:
+                                    st.button(
+                                        "🔖 Remove",
+                                        key=f"remove_bookmark_{i}",
+                                        on_click=toggle_search_bookmark,
+                                        args=(bookmark_key,),
+                                    )
+                                else:
+                                    st.button(
+                                        "📌 Bookmark",
+                                        key=f"add_bookmark_{i}",
+                                        on_click=toggle_search_bookmark,
+                                        args=(bookmark_key,),
+                                    )
+
+                            # Related guides
+                            if result.related_guides:
+                                # Show top 2
+                                related_titles = [f"🔗 {related.title}" for related in result.related_guides[:2]]
+                                st.markdown(markdown_list("**Related Guides:**", related_titles))
+
+                else:
+                    st.info(safe_translate("search.no_results", "No repair guides found for your search."))
+
+                    # Search suggestions for no results
+                    st.markdown(SEARCH_TIPS_JA if current_lang == "ja" else SEARCH_TIPS_EN)
+
+            except Exception as e:
+                logger.error(
+                    "Enhanced guide search error",
+                    exc_info=True,
+                    extra={
+                        "extra_data": {
+                            "error_type": type(e).__name__,
+                            "original_query": safe_query,
+                            "processed_query": processed_query,
+                            "filters": normalized_filters,
+                            "language": current_lang,
+                        }
+                    },
+                )
+                st.error(safe_translate("search.error", "An error occurred during search. Please try again."))
+
+    # Search history and bookmarks sidebar
+    if st.session_state.search_history or st.session_state.search_bookmarks:
+        with st.expander("📚 History & Bookmarks"):
+            history_tab, bookmark_tab = st.tabs(["History", "Bookmarks"])
+
+            with history_tab:
+                if st.session_state.search_history:
+                    st.markdown("**Recent Searches:**")
+                    for i, query in enumerate(st.session_state.search_history[:5]):
+                        st.button(f"🔄 {query}", key=f"history_{i}", on_click=use_search_query, args=(query,))
+
+                    st.button(safe_translate("search.clear_history", "Clear History"), on_click=clear_search_history)
+                else:
+                    st.info("No search history yet")
+
+            with bookmark_tab:
+                if st.session_state.search_bookmarks:
+                    st.markdown("**Bookmarked Guides:**")
+                    for bookmark in st.session_state.search_bookmarks:
+                        st.markdown(f"🔖 {bookmark}")
+                else:
+                    st.info("No bookmarks yet")
+
+
+def clear_chat_history() -> None:
+    """Reset the chat transcript from a button callback"""
+    st.session_state.chat_history = []
+
+
 def main():
     """Main application function with security and responsive design"""
     # Log application startup
@@ -842,31 +1327,26 @@ def main():
                     "skill_level": skill_level,
                 }
 
-                # Get AI response
-                with st.spinner(safe_translate("chat.thinking")):
-                    ai_response = call_chat_api(safe_message, device_context)
+            # Display chat history in a single markdown call rather than one element per message
+            if st.session_state.chat_history:
+                st.markdown(build_chat_history_html(st.session_state.chat_history), unsafe_allow_html=True)
+
+            if user_message:
+                # Stream the AI response below the history as it is generated
+                response_stream = stream_chat_api(safe_message, device_context)
+                if hasattr(st, "write_stream"):
+                    ai_response = st.write_stream(response_stream)
+                else:
+                    with st.spinner(safe_translate("chat.thinking")):
+                        ai_response = "".join(response_stream)
+                    st.markdown(ai_response)
 
                 # Add AI response to history
                 st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
 
-            # Display chat history
-            for message in st.session_state.chat_history:
-                if message["role"] == "user":
-                    st.markdown(
-                        f'<div class="chat-message user-message">{message["content"]}</div>',
-                        unsafe_allow_html=True,
-                    )
-                else:
-                    st.markdown(
-                        f'<div class="chat-message bot-message">{message["content"]}</div>',
-                        unsafe_allow_html=True,
-                    )
-
-            # Clear chat button
+            # Clear chat button (callback runs before the next rerun, so no extra st.rerun() is needed)
             if st.session_state.chat_history:
-                if st.button(safe_translate("chat.clear_history")):
-                    st.session_state.chat_history = []
-                    st.rerun()
+                st.button(safe_translate("chat.clear_history"), on_click=clear_chat_history)
 
         # Diagnosis feature
         if show_diagnosis and issue_description:
@@ -890,18 +1370,17 @@ def main():
                     if "analysis" in diagnosis_result:
                         analysis = diagnosis_result["analysis"]
 
-                        # Primary issue
+                        # Primary issue and severity, rendered as one markdown block
+                        summary_lines = []
                         if "primary_issue" in analysis:
-                            st.markdown(f"**{_('diagnosis.primary_issue')}:** {analysis['primary_issue']}")
-
-                        # Severity
+                            summary_lines.append(f"**{_('diagnosis.primary_issue')}:** {analysis['primary_issue']}")
                         if "severity" in analysis:
-                            severity_color = {
-                                "LOW": "🟢",
-                                "MEDIUM": "🟡",
-                                "HIGH": "🔴",
-                            }.get(analysis["severity"], "⚪")
-                            st.markdown(f"**{_('diagnosis.severity')}:** {severity_color} {analysis['severity']}")
+                            severity_color = SEVERITY_ICONS.get(analysis["severity"], "⚪")
+                            summary_lines.append(
+                                f"**{_('diagnosis.severity')}:** {severity_color} {analysis['severity']}"
+                            )
+                        if summary_lines:
+                            st.markdown("\n\n".join(summary_lines))
 
                         # Confidence
                         if "confidence" in analysis:
@@ -924,10 +1403,9 @@ def main():
                 if uploaded_file.size > settings.max_image_size_mb * 1024 * 1024:
                     st.error(f"{_('image_analysis.file_too_large')} ({settings.max_image_size_mb}MB)")
                 else:
-                    # Display image
-                    image = Image.open(uploaded_file)
+                    # Display image (decoded and re-encoded once per distinct upload)
                     st.image(
-                        image,
+                        encode_preview_image(uploaded_file.getvalue()),
                         caption=_("image_analysis.uploaded_image"),
                         use_column_width=True,
                     )
@@ -938,302 +1416,7 @@ def main():
     with col2:
         # Enhanced Repair guides with Japanese search
         if show_guides:
-            st.subheader(safe_translate("search.title", "🔍 Smart Search"))
-
-            # Initialize session state for search features
-            if "search_history" not in st.session_state:
-                st.session_state.search_history = []
-            if "search_bookmarks" not in st.session_state:
-                st.session_state.search_bookmarks = []
-            if "last_search_time" not in st.session_state:
-                st.session_state.last_search_time = None
-
-            # Language-aware search input
-            current_lang = st.session_state.get("language", "en")
-            if current_lang == "ja":
-                placeholder_text = safe_translate("search.input_placeholder_japanese", "例: スイッチ 画面割れ")
-            else:
-                placeholder_text = safe_translate(
-                    "search.input_placeholder", "Enter device and issue (supports Japanese)"
-                )
-
-            # Main search input with enhanced features
-            col_search, col_suggest = st.columns([3, 1])
-
-            with col_search:
-                search_query = st.text_input(
-                    safe_translate("search.japanese_input", "Smart Search"),
-                    placeholder=placeholder_text,
-                    max_chars=200,
-                    key="main_search_input",
-                )
-
-            with col_suggest:
-                if st.button("💡 Suggestions", key="search_suggestions_btn"):
-                    suggestions = get_japanese_search_suggestions()
-                    selected_suggestion = st.selectbox(
-                        safe_translate("search.suggestions", "Suggestions"),
-                        ["Select suggestion..."] + suggestions,
-                        key="suggestion_selector",
-                    )
-                    if selected_suggestion != "Select suggestion...":
-                        st.session_state.main_search_input = selected_suggestion
-                        st.rerun()
-
-            # Advanced search filters with Japanese support
-            with st.expander(safe_translate("search.filters", "🔧 Advanced Filters")):
-                filter_col1, filter_col2, filter_col3 = st.columns(3)
-
-                with filter_col1:
-                    if current_lang == "ja":
-                        difficulty_options = ["すべて", "初心者", "中級者", "上級者"]
-                    else:
-                        difficulty_options = ["All", "Beginner", "Intermediate", "Expert"]
-
-                    difficulty_filter = st.selectbox(
-                        safe_translate("search.difficulty", "Difficulty"), difficulty_options, key="difficulty_filter"
-                    )
-
-                with filter_col2:
-                    if current_lang == "ja":
-                        category_options = [
-                            "すべて",
-                            "画面修理",
-                            "バッテリー交換",
-                            "基板修理",
-                            "ボタン修理",
-                            "充電器修理",
-                            "水没修理",
-                        ]
-                    else:
-                        category_options = [
-                            "All",
-                            "Screen Repair",
-                            "Battery Replacement",
-                            "Motherboard Repair",
-                            "Button Repair",
-                            "Charger Repair",
-                            "Water Damage",
-                        ]
-
-                    category_filter = st.selectbox(
-                        safe_translate("search.category", "Category"), category_options, key="category_filter"
-                    )
-
-                with filter_col3:
-                    device_filter = st.selectbox(
-                        safe_translate("search.device_filter", "Device Filter"),
-                        ["All Devices"] + get_localized_device_categories()[1:],  # Skip "Select device"
-                        key="device_filter",
-                    )
-
-            # Search execution and results
-            if search_query:
-                start_time = time.time()
-                safe_query = sanitize_input(search_query, max_length=200)
-
-                # Preprocess Japanese query
-                processed_query = preprocess_japanese_search_query(safe_query)
-
-                # Normalize filter values
-                filter_values = {
-                    "difficulty": (
-                        difficulty_filter if difficulty_filter != "All" and difficulty_filter != "すべて" else None
-                    ),
-                    "category": category_filter if category_filter != "All" and category_filter != "すべて" else None,
-                    "device_type": device_filter if device_filter != "All Devices" else None,
-                }
-                normalized_filters = normalize_japanese_filter_values(filter_values)
-
-                with st.spinner(safe_translate("search.searching", "Searching repair guides...")):
-                    try:
-                        # Initialize repair guide service
-                        repair_service = get_repair_guide_service()
-
-                        # Create search filters
-                        search_filters = SearchFilters(
-                            device_type=normalized_filters.get("device_type"),
-                            difficulty_level=normalized_filters.get("difficulty"),
-                            category=normalized_filters.get("category"),
-                            language=current_lang,
-                        )
-
-                        # Perform search using the repair guide service
-                        import asyncio
-
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-
-                        try:
-                            search_results = loop.run_until_complete(
-                                repair_service.search_guides(query=processed_query, filters=search_filters, limit=8)
-                            )
-                        finally:
-                            loop.close()
-
-                        processing_time = time.time() - start_time
-                        st.session_state.last_search_time = processing_time
-
-                        # Add to search history
-                        if search_query not in st.session_state.search_history:
-                            st.session_state.search_history.insert(0, search_query)
-                            # Keep only last 10 searches
-                            st.session_state.search_history = st.session_state.search_history[:10]
-
-                        # Display search results with enhanced information
-                        if search_results:
-                            # Search metrics
-                            metrics_col1, metrics_col2, metrics_col3 = st.columns(3)
-                            with metrics_col1:
-                                st.metric("Results Found", len(search_results))
-                            with metrics_col2:
-                                avg_confidence = sum(r.confidence_score for r in search_results) / len(search_results)
-                                st.metric("Avg Confidence", f"{avg_confidence:.2f}")
-                            with metrics_col3:
-                                st.metric("Processing Time", f"{processing_time:.2f}s")
-
-                            st.success(
-                                safe_translate("search.results_found", "Found {count} repair guides").format(
-                                    count=len(search_results)
-                                )
-                            )
-
-                            # Display results with enhanced layout
-                            for i, result in enumerate(search_results):
-                                guide = result.guide
-
-                                # Create expandable guide section with quality indicators
-                                quality_indicator = (
-                                    "🟢"
-                                    if result.confidence_score > 0.8
-                                    else "🟡" if result.confidence_score > 0.6 else "🔴"
-                                )
-                                source_icon = (
-                                    "🌐" if result.source == "ifixit" else "💾" if result.source == "offline" else "📋"
-                                )
-
-                                with st.expander(f"{quality_indicator} {source_icon} {guide.title}"):
-                                    # Guide metadata
-                                    info_col1, info_col2, info_col3 = st.columns(3)
-
-                                    with info_col1:
-                                        st.markdown(f"**{_('guides.difficulty')}:** {guide.difficulty}")
-                                        if hasattr(guide, "time_estimate") and guide.time_estimate:
-                                            st.markdown(f"**Time:** {guide.time_estimate}")
-
-                                    with info_col2:
-                                        st.markdown(
-                                            f"**{safe_translate('search.confidence', 'Confidence')}:** {result.confidence_score:.2f}"
-                                        )
-                                        st.markdown(
-                                            f"**{safe_translate('search.source', 'Source')}:** {result.source.title()}"
-                                        )
-
-                                    with info_col3:
-                                        if result.estimated_cost:
-                                            st.markdown(f"**Cost Estimate:** {result.estimated_cost}")
-                                        if result.success_rate:
-                                            st.markdown(f"**Success Rate:** {result.success_rate:.0%}")
-
-                                    # Guide content
-                                    if guide.summary:
-                                        st.markdown(f"**{_('guides.summary')}:** {guide.summary}")
-
-                                    if result.difficulty_explanation:
-                                        st.info(f"💡 {result.difficulty_explanation}")
-
-                                    # Tools and parts
-                                    if hasattr(guide, "tools_required") and guide.tools_required:
-                                        st.markdown(f"**{_('guides.tools_required')}:**")
-                                        for tool in guide.tools_required:
-                                            st.markdown(f"- {tool}")
-
-                                    if hasattr(guide, "parts") and guide.parts:
-                                        st.markdown(f"**Parts Required:**")
-                                        for part in guide.parts:
-                                            st.markdown(f"- {part}")
-
-                                    # Warnings
-                                    if hasattr(guide, "warnings") and guide.warnings:
-                                        for warning in guide.warnings:
-                                            st.warning(f"⚠️ {warning}")
-
-                                    # Bookmark functionality
-                                    bookmark_col1, bookmark_col2 = st.columns([3, 1])
-                                    with bookmark_col2:
-                                        bookmark_key = f"{guide.guideid}_{guide.title[:20]}"
-                                        if bookmark_key in st.session_state.search_bookmarks:
-                                            if st.button("🔖 Remove", key=f"remove_bookmark_{i}"):
-                                                st.session_state.search_bookmarks.remove(bookmark_key)
-                                                st.rerun()
-                                        else:
-                                            if st.button("📌 Bookmark", key=f"add_bookmark_{i}"):
-                                                st.session_state.search_bookmarks.append(bookmark_key)
-                                                st.rerun()
-
-                                    # Related guides
-                                    if result.related_guides:
-                                        st.markdown("**Related Guides:**")
-                                        for related in result.related_guides[:2]:  # Show top 2
-                                            st.markdown(f"- 🔗 {related.title}")
-
-                        else:
-                            st.info(safe_translate("search.no_results", "No repair guides found for your search."))
-
-                            # Search suggestions for no results
-                            if current_lang == "ja":
-                                st.markdown("**検索のコツ:**")
-                                st.markdown("- より一般的な用語を使用してみてください")
-                                st.markdown("- デバイス名と問題を分けて検索してみてください")
-                                st.markdown("- 英語での検索も試してみてください")
-                            else:
-                                st.markdown("**Search Tips:**")
-                                st.markdown("- Try using more general terms")
-                                st.markdown("- Search for device and issue separately")
-                                st.markdown("- Japanese search is also supported")
-
-                    except Exception as e:
-                        logger.error(
-                            "Enhanced guide search error",
-                            exc_info=True,
-                            extra={
-                                "extra_data": {
-                                    "error_type": type(e).__name__,
-                                    "original_query": safe_query,
-                                    "processed_query": processed_query,
-                                    "filters": normalized_filters,
-                                    "language": current_lang,
-                                }
-                            },
-                        )
-                        st.error(safe_translate("search.error", "An error occurred during search. Please try again."))
-
-            # Search history and bookmarks sidebar
-            if st.session_state.search_history or st.session_state.search_bookmarks:
-                with st.expander("📚 History & Bookmarks"):
-                    history_tab, bookmark_tab = st.tabs(["History", "Bookmarks"])
-
-                    with history_tab:
-                        if st.session_state.search_history:
-                            st.markdown("**Recent Searches:**")
-                            for i, query in enumerate(st.session_state.search_history[:5]):
-                                if st.button(f"🔄 {query}", key=f"history_{i}"):
-                                    st.session_state.main_search_input = query
-                                    st.rerun()
-
-                            if st.button(safe_translate("search.clear_history", "Clear History")):
-                                st.session_state.search_history = []
-                                st.rerun()
-                        else:
-                            st.info("No search history yet")
-
-                    with bookmark_tab:
-                        if st.session_state.search_bookmarks:
-                            st.markdown("**Bookmarked Guides:**")
-                            for bookmark in st.session_state.search_bookmarks:
-                                st.markdown(f"🔖 {bookmark}")
-                        else:
-                            st.info("No bookmarks yet")
+            guide_search_section()
 
         # Responsive design info
         if settings.debug:
@@ -12,7 +12,9 @@ from typing import Dict, List
 # Add src directory to path for imports FIRST
 current_dir = Path(__file__).parent
 src_root = current_dir.parent
-sys.path.insert(0, str(src_root))
+# Streamlit re-executes this script on every rerun, so only add the path once
+if str(src_root) not in sys.path:
+    sys.path.insert(0, str(src_root))
 
 import requests
 import streamlit as st
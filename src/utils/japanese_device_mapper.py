@@ -13,10 +13,30 @@ Features:
 - Fuzzy matching capabilities
 """
 
+import functools
 import re
+import threading
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Set, Tuple
 
+try:
+    from rapidfuzz import fuzz, process
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Spaces and common punctuation, and leading articles, dropped by _normalize_device_text
+_IGNORED_CHARS_RE = re.compile(r"[\s\-_\.,!?()（）]")
+_LEADING_ARTICLE_RE = re.compile(r"^(the|a|an)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_device_text(text: str) -> str:
+    """Lowercase text and strip spaces, punctuation and a leading article; memoized per word"""
+    text = _IGNORED_CHARS_RE.sub("", text.lower())
+    return _LEADING_ARTICLE_RE.sub("", text)
+
 
 class JapaneseDeviceMapper:
     """
@@ -305,16 +325,9 @@ class JapaneseDeviceMapper:
         if not text:
             return ""
 
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove spaces and common punctuation
-        text = re.sub(r"[\s\-_\.,!?()（）]", "", text)
-
-        # Remove common prefixes/suffixes that might interfere
-        text = re.sub(r"^(the|a|an)", "", text)
-
-        return text
+        # The same words are normalized by is_device_name, map_device_name and
+        # find_best_match for every query, so the result is cached per word
+        return _normalize_device_text(text)
 
     def map_device_name(self, japanese_name: str) -> Optional[str]:
         """
@@ -352,13 +365,50 @@ class JapaneseDeviceMapper:
             return None
 
         normalized_input = self._normalize_text(japanese_name)
+
+        # Scores are always SequenceMatcher.ratio(), whether or not rapidfuzz is installed
+        rapidfuzz_bounds = None
+        if RAPIDFUZZ_AVAILABLE:
+            # fuzz.ratio is the indel (LCS) similarity, which is never below SequenceMatcher.ratio(),
+            # so one C++ pass drops every key that cannot reach the threshold. The cutoff is nudged
+            # down so float rounding cannot drop a key sitting exactly on the threshold
+            score_cutoff = min(max(threshold * 100 - 1e-6, 0.0), 100.0)
+            rapidfuzz_bounds = {
+                key: score / 100
+                for key, score, _ in process.extract(
+                    normalized_input,
+                    self._normalized_mappings.keys(),
+                    scorer=fuzz.ratio,
+                    score_cutoff=score_cutoff,
+                    limit=None,
+                )
+            }
+
         best_match = None
         best_score = 0.0
+        input_length = len(normalized_input)
 
         # Check against all normalized mappings
         for normalized_key, english_name in self._normalized_mappings.items():
-            # Calculate similarity using SequenceMatcher
-            similarity = SequenceMatcher(None, normalized_input, normalized_key).ratio()
+            if rapidfuzz_bounds is not None:
+                upper_bound = rapidfuzz_bounds.get(normalized_key)
+                if upper_bound is None or upper_bound <= best_score:
+                    continue
+            else:
+                # The length ratio bounds the similarity from above, so keys that cannot
+                # beat the current best (or reach the threshold) skip SequenceMatcher
+                total_length = input_length + len(normalized_key)
+                if total_length:
+                    upper_bound = 2.0 * min(input_length, len(normalized_key)) / total_length
+                    if upper_bound < threshold or upper_bound <= best_score:
+                        continue
+
+            # Calculate similarity using SequenceMatcher, after its cheaper character-count bound
+            matcher = SequenceMatcher(None, normalized_input, normalized_key)
+            quick_ratio = matcher.quick_ratio()
+            if quick_ratio < threshold or quick_ratio <= best_score:
+                continue
+            similarity = matcher.ratio()
 
             if similarity > best_score and similarity >= threshold:
                 best_score = similarity
@@ -464,18 +514,21 @@ class JapaneseDeviceMapper:
 
 # Convenience functions for common use cases
 _mapper_instance: Optional[JapaneseDeviceMapper] = None
+_instance_lock = threading.Lock()
 
 
 def get_mapper() -> JapaneseDeviceMapper:
     """
-    Get singleton instance of JapaneseDeviceMapper.
+    Get thread-safe singleton instance of JapaneseDeviceMapper.
 
     Returns:
         JapaneseDeviceMapper instance
     """
     global _mapper_instance
     if _mapper_instance is None:
-        _mapper_instance = JapaneseDeviceMapper()
+        with _instance_lock:
+            if _mapper_instance is None:
+                _mapper_instance = JapaneseDeviceMapper()
     return _mapper_instance
 
 
@@ -260,3 +260,51 @@ class TestErrorHandling:
         special_message = "My device has 特殊文字 and émojis 🔧🛠️ and symbols @#$%"
         response = configured_chatbot.chat(special_message)
         assert isinstance(response, str)
+
+
+class TestChatStreaming:
+    """Test streaming chat responses"""
+
+    def test_non_streaming_client_yields_single_chunk(self):
+        """Clients without provider streaming yield the full reply once"""
+        chatbot = RepairChatbot(use_mock=True)
+        chunks = list(chatbot.chat_stream("How do I fix this?"))
+
+        assert len(chunks) == 1
+        assert chunks[0] == chatbot.conversation_history[-1].content
+
+    def test_openai_stream_yields_deltas_and_records_response(self):
+        """Streamed OpenAI deltas are yielded in order and stored as one assistant message"""
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        def event(content):
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+        chatbot = RepairChatbot(use_mock=True)
+        chatbot.active_client = "openai"
+        chatbot.openai_client = MagicMock()
+        chatbot.openai_client.chat.completions.create.return_value = iter(
+            [event("Check "), event(None), event("the battery.")]
+        )
+
+        chunks = list(chatbot.chat_stream("My phone won't charge"))
+
+        assert chunks == ["Check ", "the battery."]
+        assert chatbot.openai_client.chat.completions.create.call_args.kwargs["stream"] is True
+        assert [m.role for m in chatbot.conversation_history] == ["user", "assistant"]
+        assert chatbot.conversation_history[-1].content == "Check the battery."
+
+    def test_stream_failure_before_output_falls_back(self):
+        """A provider error before any output yields the fallback response"""
+        from unittest.mock import MagicMock
+
+        chatbot = RepairChatbot(use_mock=True)
+        chatbot.active_client = "openai"
+        chatbot.openai_client = MagicMock()
+        chatbot.openai_client.chat.completions.create.side_effect = RuntimeError("boom")
+
+        chunks = list(chatbot.chat_stream("Screen is cracked"))
+
+        assert len(chunks) == 1
+        assert chunks[0] == chatbot.conversation_history[-1].content
@@ -0,0 +1,88 @@
+"""Tests for the offline repair database"""
+
+import pytest
+
+from src.data.offline_repair_database import OfflineRepairDatabase
+
+
+@pytest.fixture(scope="module")
+def db():
+    """One database for the module; construction builds the search indexes"""
+    return OfflineRepairDatabase()
+
+
+def _scan_search(db, query, device_type="", limit=10):
+    """Reference implementation: rebuild each guide's text on every query"""
+    device_lower = device_type.lower()
+    matches = []
+    for guide in db.guides:
+        text = f"{guide.title} {guide.device} {guide.category}".lower()
+        if device_lower and device_lower not in text:
+            continue
+        if any(term in text for term in query.lower().split()):
+            matches.append(guide)
+    if device_lower:
+        matches.sort(key=lambda g: device_lower in g.device.lower(), reverse=True)
+    return matches[:limit]
+
+
+class TestOfflineRepairDatabaseSearch:
+    """Test offline guide search"""
+
+    @pytest.mark.parametrize(
+        "query,device_type",
+        [
+            ("joy-con drift", ""),
+            ("joy", ""),
+            ("screen", "iPhone"),
+            ("battery", ""),
+            ("BATTERY replacement", "iphone"),
+            ("repair", "Nintendo Switch"),
+            ("nothing-matches-this", ""),
+            ("", ""),
+        ],
+    )
+    def test_search_matches_full_scan(self, db, query, device_type):
+        """Precomputed search text returns the same guides as scanning every guide"""
+        assert db.search_guides(query, device_type) == _scan_search(db, query, device_type)
+
+    def test_search_respects_limit(self, db):
+        """Results are truncated to the requested limit"""
+        assert len(db.search_guides("repair", limit=1)) <= 1
+
+
+class TestOfflineRepairDatabaseLookups:
+    """Test the precomputed lookup indexes"""
+
+    def test_get_guide_by_id(self, db):
+        """Every guide is reachable by its ID and unknown IDs return None"""
+        for guide in db.guides:
+            assert db.get_guide_by_id(guide.id) is guide
+        assert db.get_guide_by_id("does_not_exist") is None
+
+    def test_get_guides_by_device_uses_substring_match(self, db):
+        """Device lookup is case-insensitive and matches partial names"""
+        expected = [guide for guide in db.guides if "switch" in guide.device.lower()]
+        assert expected
+        assert db.get_guides_by_device("SWITCH") == expected
+
+    def test_device_and_category_lists(self, db):
+        """Device and category lists are sorted, unique and safe to mutate"""
+        assert db.get_all_devices() == sorted({guide.device for guide in db.guides})
+        assert db.get_all_categories() == sorted({guide.category for guide in db.guides})
+
+        db.get_all_devices().clear()
+        assert db.get_all_devices()
+
+    def test_repeated_search_is_memoized(self, db):
+        """Identical searches hit the cache and return independent lists"""
+        first = db.search_guides("screen", "iPhone", 5)
+        assert first
+        hits_before = db._cached_search.cache_info().hits
+
+        second = db.search_guides("screen", "iPhone", 5)
+        assert db._cached_search.cache_info().hits == hits_before + 1
+        assert second == first
+
+        second.clear()
+        assert db.search_guides("screen", "iPhone", 5) == first
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from src.clients.ifixit_client import Guide
 from src.services.repair_guide_service import (
+    MappingAnalysis,
     RepairGuideService,
     SearchFilters,
 )
@@ -80,7 +81,7 @@ class TestDeterministicConfidenceScoring:
              patch.object(self.service, '_assess_japanese_mapping_quality', return_value=0.9), \
              patch.object(self.service, '_evaluate_fuzzy_matching_confidence', return_value=0.85), \
              patch.object(self.service, '_analyze_device_mapping_quality', 
-                         return_value={'direct_mappings': 1, 'fuzzy_mappings': 0, 'total_device_terms': 1, 'unmapped_terms': 0}), \
+                         return_value=MappingAnalysis(direct_mappings=1, fuzzy_mappings=0, total_device_terms=1, unmapped_terms=0)), \
              patch.object(self.service, '_is_mixed_language_query', return_value=False):
 
             # Run scoring multiple times
@@ -161,7 +162,7 @@ class TestDeterministicConfidenceScoring:
              patch.object(self.service, '_assess_japanese_mapping_quality', return_value=0.95), \
              patch.object(self.service, '_evaluate_fuzzy_matching_confidence', return_value=0.9), \
              patch.object(self.service, '_analyze_device_mapping_quality', 
-                         return_value={'direct_mappings': 1, 'fuzzy_mappings': 0, 'total_device_terms': 1, 'unmapped_terms': 0}):
+                         return_value=MappingAnalysis(direct_mappings=1, fuzzy_mappings=0, total_device_terms=1, unmapped_terms=0)):
 
             # Run scoring multiple times
             scores = []
@@ -292,5 +293,55 @@ class TestDeterministicConfidenceScoring:
                 assert all(0.0 <= score <= 1.0 for score in scores), f"Scores outside bounds: {scores}"
 
 
+class TestScoreMemoization:
+    """Test that batch scoring reuses scores across searches"""
+
+    def setup_method(self):
+        """Set up test environment before each test"""
+        with patch('src.services.repair_guide_service.IFixitClient'), \
+             patch('src.services.repair_guide_service.OfflineRepairDatabase'), \
+             patch('src.services.repair_guide_service.CacheManager'), \
+             patch('src.services.repair_guide_service.RateLimiter'):
+            self.service = RepairGuideService(ifixit_api_key="test_key", enable_japanese_support=True)
+
+    def create_guide(self, guideid=1, title="Nintendo Switch Screen Repair"):
+        """Create a guide with the fields scoring reads"""
+        return Guide(
+            guideid=guideid, title=title, url="http://example.com/guide", summary="",
+            difficulty="Moderate", tools=["Phillips Screwdriver"], parts=["Screen"],
+            category="Screen Repair", device="Nintendo Switch",
+        )
+
+    def test_repeated_search_reuses_scores(self):
+        """Scoring the same guides for the same search twice computes each score once"""
+        guides = [self.create_guide(1), self.create_guide(2, title="Switch Battery Replacement")]
+        filters = SearchFilters(difficulty_level="moderate")
+        context = self.service._build_scoring_context("switch screen", filters)
+        direct = [self.service._calculate_confidence_score(g, "switch screen", filters, context) for g in guides]
+
+        with patch.object(
+            self.service, '_calculate_confidence_score', wraps=self.service._calculate_confidence_score
+        ) as spy:
+            first = self.service._score_guides(guides, "switch screen", filters, context)
+            second = self.service._score_guides(guides, "switch screen", filters, context)
+
+        assert first == second == direct
+        assert spy.call_count == 2
+
+    def test_different_search_is_rescored(self):
+        """A different query produces a different context and is not served from the memo"""
+        guides = [self.create_guide()]
+        filters = SearchFilters()
+
+        with patch.object(
+            self.service, '_calculate_confidence_score', wraps=self.service._calculate_confidence_score
+        ) as spy:
+            for query in ("switch screen", "iphone battery"):
+                context = self.service._build_scoring_context(query, filters)
+                self.service._score_guides(guides, query, filters, context)
+
+        assert spy.call_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -171,7 +171,7 @@ class TestCacheKeyPerformance:
     """Performance tests for cache key generation."""
     
     def test_cache_key_generation_performance(self):
-        """Test cache key generation performance with SHA-256."""
+        """Test cache key generation performance with BLAKE2b-128."""
         from src.services.repair_guide_service import RepairGuideService
         
         service = RepairGuideService(enable_offline_fallback=False)
@@ -13,6 +13,7 @@ import pytest
 
 from src.clients.ifixit_client import Guide
 from src.services.repair_guide_service import (
+    MappingAnalysis,
     RepairGuideResult,
     RepairGuideService,
     SearchFilters,
@@ -997,10 +998,10 @@ class TestAdvancedJapaneseConfidenceScoring:
             
             analysis = self.service._analyze_device_mapping_quality("スイッチ あいふぉん 未知デバイス")
             
-            assert analysis['direct_mappings'] == 2, "Should have 2 direct mappings"
-            assert analysis['fuzzy_mappings'] == 1, "Should have 1 fuzzy mapping"
-            assert analysis['total_device_terms'] == 3, "Should have 3 total device terms"
-            assert analysis['unmapped_terms'] == 0, "Should have 0 unmapped terms"
+            assert analysis.direct_mappings == 2, "Should have 2 direct mappings"
+            assert analysis.fuzzy_mappings == 1, "Should have 1 fuzzy mapping"
+            assert analysis.total_device_terms == 3, "Should have 3 total device terms"
+            assert analysis.unmapped_terms == 0, "Should have 0 unmapped terms"
 
     def test_is_mixed_language_query(self):
         """Test mixed language query detection"""
@@ -1056,7 +1057,7 @@ class TestAdvancedJapaneseConfidenceScoring:
              patch.object(self.service, '_calculate_japanese_ratio', return_value=0.8), \
              patch.object(self.service, '_evaluate_fuzzy_matching_confidence', return_value=0.85), \
              patch.object(self.service, '_analyze_device_mapping_quality', 
-                         return_value={'direct_mappings': 1, 'fuzzy_mappings': 0, 'total_device_terms': 1, 'unmapped_terms': 0}):
+                         return_value=MappingAnalysis(direct_mappings=1, fuzzy_mappings=0, total_device_terms=1, unmapped_terms=0)):
             
             filters = SearchFilters()
             japanese_score = self.service._calculate_confidence_score(mock_guide, "スイッチ 画面修理", filters)
@@ -1092,7 +1093,7 @@ class TestAdvancedJapaneseConfidenceScoring:
              patch.object(self.service, '_calculate_japanese_ratio', return_value=1.0), \
              patch.object(self.service, '_evaluate_fuzzy_matching_confidence', return_value=0.4), \
              patch.object(self.service, '_analyze_device_mapping_quality', 
-                         return_value={'direct_mappings': 0, 'fuzzy_mappings': 1, 'total_device_terms': 2, 'unmapped_terms': 1}):
+                         return_value=MappingAnalysis(direct_mappings=0, fuzzy_mappings=1, total_device_terms=2, unmapped_terms=1)):
             
             filters = SearchFilters()
             score = self.service._calculate_confidence_score(mock_guide, "未知デバイス 修理", filters)
@@ -1418,9 +1419,9 @@ class TestJapaneseSearchCompleteMethodCoverage:
             
             cache_key = self.service._create_search_cache_key(query, filters, limit)
             
-            # Should return SHA-256 hash (64 hex characters)
+            # Should return BLAKE2b-128 hash (32 hex characters)
             assert isinstance(cache_key, str)
-            assert len(cache_key) == 64
+            assert len(cache_key) == 32
             assert all(c in '0123456789abcdef' for c in cache_key)
 
     @pytest.mark.asyncio
@@ -0,0 +1,433 @@
+"""
+Unit tests for RepairGuideService rate limiting and caching internals.
+
+This module tests:
+1. Sliding-window-counter RateLimiter behaviour
+2. Redis-backed RateLimiter shared across workers
+3. Rate limit budget under concurrent searches
+4. CacheManager in-memory fallback expiry and LRU eviction
+5. CacheManager Redis payload serialization
+6. CacheManager per-domain TTL policy
+7. CacheManager domain index and invalidation
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services import repair_guide_service
+from src.clients.ifixit_client import Guide
+from src.services.repair_guide_service import (
+    TTL_POLICY,
+    CacheManager,
+    RateLimiter,
+    RepairGuideResult,
+    RepairGuideService,
+)
+
+
+@pytest.fixture
+def fake_clock():
+    """Patch the monotonic clock used by the service module with a controllable one."""
+    clock = [1000.0]
+    with patch.object(repair_guide_service.time, "monotonic", lambda: clock[0]):
+        yield clock
+
+
+class TestSlidingWindowRateLimiter:
+    """Test the O(1) sliding-window-counter rate limiter."""
+
+    def test_allows_up_to_max_calls(self, fake_clock):
+        """Requests are allowed until the window budget is used up."""
+        limiter = RateLimiter(max_calls=3, time_window=10)
+
+        for _ in range(3):
+            assert limiter.can_make_request()
+
+        assert not limiter.can_make_request()
+        assert limiter.remaining_calls() == 0
+
+    def test_can_make_request_reserves_the_call(self, fake_clock):
+        """An allowed check counts immediately, so back-to-back checks cannot overshoot."""
+        limiter = RateLimiter(max_calls=1, time_window=10)
+
+        assert limiter.can_make_request()
+        assert limiter.curr_count == 1
+        assert not limiter.can_make_request()
+        assert limiter.curr_count == 1
+
+    def test_record_request_is_noop(self, fake_clock):
+        """Calls are recorded by can_make_request, not by record_request."""
+        limiter = RateLimiter(max_calls=1, time_window=10)
+
+        limiter.record_request()
+
+        assert limiter.curr_count == 0
+        assert limiter.can_make_request()
+
+    def test_time_until_next_request_when_current_window_full(self, fake_clock):
+        """A full current window must roll over before more requests are allowed."""
+        limiter = RateLimiter(max_calls=2, time_window=10)
+        assert limiter.can_make_request()
+        assert limiter.can_make_request()
+
+        assert limiter.time_until_next_request() == 10
+
+        fake_clock[0] += 4
+        assert limiter.time_until_next_request() == 6
+
+    def test_previous_window_is_weighted_by_overlap(self, fake_clock):
+        """Calls from the previous window count proportionally to their overlap."""
+        limiter = RateLimiter(max_calls=4, time_window=10)
+        for _ in range(4):
+            assert limiter.can_make_request()
+
+        # Start of the next window: the previous 4 calls still fully overlap
+        fake_clock[0] += 10
+        assert not limiter.can_make_request()
+        assert limiter.time_until_next_request() >= 1
+
+        # Halfway through: 4 * 0.5 = 2 calls remain in the sliding window
+        fake_clock[0] += 5
+        assert limiter.remaining_calls() == 2
+        assert limiter.can_make_request()
+        assert limiter.remaining_calls() == 1
+
+    def test_idle_windows_reset_counts(self, fake_clock):
+        """After more than one idle window, no previous calls are counted."""
+        limiter = RateLimiter(max_calls=1, time_window=10)
+        assert limiter.can_make_request()
+
+        fake_clock[0] += 25
+        assert limiter.time_until_next_request() == 0
+        assert limiter.prev_count == 0
+        assert limiter.can_make_request()
+
+
+class TestRedisRateLimiter:
+    """Test the Redis sorted-set rate limiter and its in-process fallback."""
+
+    def test_can_make_request_uses_atomic_script(self):
+        """The Lua script decides and reserves the call in one round-trip."""
+        redis_client = MagicMock()
+        script = redis_client.register_script.return_value
+        script.side_effect = [1, 0]
+        limiter = RateLimiter(max_calls=5, time_window=60, redis_client=redis_client)
+
+        assert limiter.can_make_request()
+        assert not limiter.can_make_request()
+
+        kwargs = script.call_args.kwargs
+        assert kwargs["keys"] == ["repairgpt:ratelimit:ifixit"]
+        assert kwargs["args"][1:3] == [60, 5]
+
+    def test_record_request_is_noop_with_redis(self, fake_clock):
+        """Calls are recorded by the script, not by the local counter."""
+        redis_client = MagicMock()
+        limiter = RateLimiter(max_calls=5, time_window=60, redis_client=redis_client)
+
+        limiter.record_request()
+
+        assert limiter.curr_count == 0
+
+    def test_falls_back_to_local_counter_on_redis_error(self, fake_clock):
+        """A Redis failure switches the limiter to the in-process counter."""
+        redis_client = MagicMock()
+        redis_client.register_script.return_value.side_effect = ConnectionError("down")
+        limiter = RateLimiter(max_calls=1, time_window=60, redis_client=redis_client)
+
+        assert limiter.can_make_request()
+        assert limiter.curr_count == 1
+        assert not limiter.can_make_request()
+
+    def test_redis_is_retried_after_backoff(self, fake_clock):
+        """A transient Redis error only disables the shared limiter until the backoff passes."""
+        redis_client = MagicMock()
+        script = redis_client.register_script.return_value
+        script.side_effect = [ConnectionError("blip"), 1]
+        limiter = RateLimiter(max_calls=5, time_window=60, redis_client=redis_client)
+
+        # The failing call and calls within the backoff use the local counter, without touching Redis
+        assert limiter.can_make_request()
+        assert limiter.can_make_request()
+        assert limiter.curr_count == 2
+        assert script.call_count == 1
+        assert limiter.redis_client is redis_client
+
+        # After the backoff the script is registered again and the shared window is used
+        fake_clock[0] += repair_guide_service._REDIS_RETRY_SECONDS
+        assert limiter.can_make_request()
+        assert script.call_count == 2
+        assert redis_client.register_script.call_count == 2
+        assert limiter.curr_count == 2
+
+    def test_failed_script_registration_is_retried(self, fake_clock):
+        """Redis being down at start-up does not disable the shared limiter for good."""
+        redis_client = MagicMock()
+        redis_client.register_script.side_effect = [ConnectionError("down"), MagicMock(return_value=1)]
+        limiter = RateLimiter(max_calls=5, time_window=60, redis_client=redis_client)
+
+        assert limiter.can_make_request()
+        assert limiter.curr_count == 1
+        assert redis_client.register_script.call_count == 1
+
+        fake_clock[0] += repair_guide_service._REDIS_RETRY_SECONDS
+        assert limiter.can_make_request()
+        assert redis_client.register_script.call_count == 2
+        assert limiter.curr_count == 1
+
+
+class TestConcurrentRateLimit:
+    """Test that concurrent searches share the rate limit budget."""
+
+    @pytest.mark.asyncio
+    async def test_gathered_searches_do_not_exceed_limit(self):
+        """Only one of several concurrent searches may reach iFixit with a budget of one call."""
+        service = RepairGuideService(enable_offline_fallback=False, enable_japanese_support=False)
+        service.rate_limiter = RateLimiter(max_calls=1, time_window=3600)
+        service.ifixit_client = MagicMock()
+        # Block in the worker thread so every search is in flight before any fetch returns
+        service.ifixit_client.search_guides.side_effect = lambda query, limit: time.sleep(0.05) or []
+
+        await asyncio.gather(
+            *(
+                service.search_guides(query, use_cache=False, enhance_related=False)
+                for query in ("iphone screen", "switch battery", "laptop fan")
+            )
+        )
+
+        assert service.ifixit_client.search_guides.call_count == 1
+        assert service.rate_limiter.remaining_calls() == 0
+
+
+class TestMemoryCache:
+    """Test the in-memory fallback of CacheManager."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        return CacheManager(ttl=60)
+
+    def test_entry_expires_after_ttl(self, cache, fake_clock):
+        """Entries are served until their monotonic expiry and dropped afterwards."""
+        cache.set("key", {"value": 1}, domain="misc")
+
+        fake_clock[0] += 59
+        assert cache.get("key", domain="misc") == {"value": 1}
+
+        fake_clock[0] += 1
+        assert cache.get("key", domain="misc") is None
+        assert cache.memory_cache == {}
+
+    def test_expiry_is_fixed_at_write_time(self, cache, fake_clock):
+        """Changing the ttl later does not extend entries already written."""
+        cache.set("key", "data", domain="misc")
+        cache.ttl = 3600
+
+        fake_clock[0] += 61
+        assert cache.get("key", domain="misc") is None
+
+    def test_evicts_least_recently_used(self, cache, fake_clock):
+        """Overflowing the cache drops the least recently used entry only."""
+        for i in range(1000):
+            cache.set(f"key{i}", i)
+
+        # Touch the oldest entry so the next one becomes the LRU victim
+        assert cache.get("key0") == 0
+        cache.set("overflow", "new")
+
+        assert len(cache.memory_cache) == 1000
+        assert cache.get("key0") == 0
+        assert cache.get("key1") is None
+        assert cache.get("overflow") == "new"
+
+
+class TestCacheSerialization:
+    """Test the Redis payload round-trip of CacheManager."""
+
+    def test_redis_round_trip(self, monkeypatch):
+        """Values written to Redis are read back unchanged."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        cache = CacheManager(ttl=60)
+        store = {}
+        cache.redis_client = MagicMock()
+        pipe = cache.redis_client.pipeline.return_value
+        pipe.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+        cache.redis_client.get.side_effect = store.get
+
+        payload = [{"title": "画面交換", "score": 0.9, "tools": ["ドライバー"]}]
+        cache.set("query", payload)
+
+        assert isinstance(next(iter(store.values())), bytes)
+        assert cache.get("query") == payload
+        assert cache.memory_cache == {}
+
+    def test_dataclasses_are_serialized_without_asdict(self, monkeypatch):
+        """RepairGuideResult lists can be cached directly; datetimes become ISO strings."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        cache = CacheManager()
+        store = {}
+        cache.redis_client = MagicMock()
+        pipe = cache.redis_client.pipeline.return_value
+        pipe.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+        cache.redis_client.get.side_effect = store.get
+
+        guide = Guide(
+            guideid=1,
+            title="Screen",
+            url="u",
+            summary="",
+            difficulty="Easy",
+            tools=[],
+            parts=[],
+            category="c",
+            device="d",
+        )
+        result = RepairGuideResult(
+            guide=guide, source="ifixit", confidence_score=0.5, last_updated=datetime(2026, 1, 1, 10, 0)
+        )
+        cache.set("query", [result])
+
+        cached = cache.get("query")
+        assert cached[0]["guide"]["title"] == "Screen"
+        assert cached[0]["last_updated"] == "2026-01-01T10:00:00"
+
+    def test_memory_cache_stores_detached_snapshot(self, monkeypatch):
+        """Mutating a result after caching it does not change the memory-cache copy."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        cache = CacheManager()
+        guide = Guide(
+            guideid=1,
+            title="Screen",
+            url="u",
+            summary="",
+            difficulty="Easy",
+            tools=[],
+            parts=[],
+            category="c",
+            device="d",
+        )
+        result = RepairGuideResult(guide=guide, source="ifixit", confidence_score=0.5, last_updated=datetime.now())
+
+        cache.set("query", [result])
+        result.related_guides = [guide]
+
+        assert cache.get("query")[0]["related_guides"] is None
+
+    def test_from_cache_rehydrates_nested_guides(self, monkeypatch):
+        """Cached dicts are rebuilt into Guide objects with a parsed last_updated."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        cache = CacheManager()
+        guide = Guide(
+            guideid=1,
+            title="Screen",
+            url="u",
+            summary="",
+            difficulty="Easy",
+            tools=["Spudger"],
+            parts=[],
+            category="c",
+            device="d",
+        )
+        result = RepairGuideResult(
+            guide=guide,
+            source="ifixit",
+            confidence_score=0.5,
+            last_updated=datetime(2026, 1, 1, 10, 0),
+            related_guides=[guide],
+        )
+        cache.set("query", [result])
+
+        restored = RepairGuideResult.from_cache(cache.get("query")[0])
+
+        assert isinstance(restored.guide, repair_guide_service.Guide)
+        assert restored.guide.tools == ["Spudger"]
+        assert [g.title for g in restored.related_guides] == ["Screen"]
+        assert restored.last_updated == datetime(2026, 1, 1, 10, 0)
+
+
+class TestCacheTTLPolicy:
+    """Test TTL routing by cache domain."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        return CacheManager()
+
+    def test_domains_expire_independently(self, cache, fake_clock):
+        """Trending entries expire before search entries written at the same time."""
+        cache.set("key", "trending", domain="trending")
+        cache.set("key", "search", domain="search")
+
+        fake_clock[0] += TTL_POLICY["trending"]
+        assert cache.get("key", domain="trending") is None
+        assert cache.get("key", domain="search") == "search"
+
+    def test_redis_setex_uses_domain_ttl_and_prefix(self, cache):
+        """The domain selects both the Redis key prefix and its expiry."""
+        cache.redis_client = MagicMock()
+        pipe = cache.redis_client.pipeline.return_value
+
+        cache.set("guides_10", [], domain="trending")
+
+        pipe.setex.assert_called_once()
+        key, ttl, _ = pipe.setex.call_args.args
+        assert key.startswith("repairgpt:trending:")
+        assert ttl == TTL_POLICY["trending"]
+
+    def test_unknown_domain_uses_default_ttl(self, cache):
+        """Domains outside the policy fall back to the constructor ttl."""
+        assert cache.ttl_for("unknown") == cache.ttl
+        assert cache.ttl_for("device") == TTL_POLICY["device"]
+
+
+class TestCacheDomainInvalidation:
+    """Test the per-domain key index used for targeted invalidation."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        return CacheManager()
+
+    def test_set_indexes_key_in_one_pipeline(self, cache):
+        """SETEX, SADD and EXPIRE of the index go out in a single pipeline."""
+        cache.redis_client = MagicMock()
+        pipe = cache.redis_client.pipeline.return_value
+
+        cache.set("guides_10", [], domain="trending")
+
+        cache.redis_client.pipeline.assert_called_once_with(transaction=False)
+        cache_key = pipe.setex.call_args.args[0]
+        pipe.sadd.assert_called_once_with("repairgpt:index:trending", cache_key)
+        pipe.expire.assert_called_once_with("repairgpt:index:trending", TTL_POLICY["trending"] * 2)
+        pipe.execute.assert_called_once()
+
+    def test_invalidate_domain_unlinks_indexed_keys_in_batches(self, cache):
+        """Indexed keys are unlinked in batches, followed by the index itself."""
+        cache.redis_client = MagicMock()
+        keys = [f"repairgpt:trending:{i}" for i in range(5)]
+        cache.redis_client.sscan_iter.return_value = iter(keys)
+        cache.redis_client.unlink.side_effect = lambda *batch: len(batch)
+
+        removed = cache.invalidate_domain("trending", batch_size=2)
+
+        assert removed == 5  # The index key itself is not counted
+        batches = [c.args for c in cache.redis_client.unlink.call_args_list]
+        assert batches == [tuple(keys[:2]), tuple(keys[2:4]), (keys[4],), ("repairgpt:index:trending",)]
+
+    def test_invalidate_domain_clears_memory_entries_of_that_domain(self, cache):
+        """Only memory entries of the invalidated domain are dropped."""
+        cache.set("a", 1, domain="trending")
+        cache.set("b", 2, domain="trending")
+        cache.set("a", 3, domain="search")
+
+        assert cache.invalidate_domain("trending") == 2
+        assert cache.get("a", domain="trending") is None
+        assert cache.get("a", domain="search") == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
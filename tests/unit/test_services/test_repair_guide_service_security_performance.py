@@ -2,7 +2,7 @@
 Unit tests for RepairGuideService security and performance improvements.
 
 This module tests the fixes for:
-1. MD5 → SHA-256 security improvements
+1. Cache key hashing (BLAKE2b-128)
 2. Category search performance optimization (O(n) → O(1))
 3. Type safety improvements
 4. Enhanced error handling
@@ -14,7 +14,6 @@ import os
 # Import the service and related classes
 import sys
 import time
-from typing import Dict, List
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -33,63 +32,74 @@ from src.services.repair_guide_service import (
 
 
 class TestSecurityImprovements:
-    """Test security improvements (MD5 → SHA-256)."""
-    
-    def test_cache_manager_uses_sha256_for_long_identifiers(self):
-        """Test that CacheManager uses SHA-256 for long identifiers."""
+    """Test cache key hashing (BLAKE2b-128 for every key)."""
+
+    def test_cache_manager_uses_blake2b_for_long_identifiers(self):
+        """Test that CacheManager hashes long identifiers with BLAKE2b-128."""
         cache_manager = CacheManager()
-        
+
         # Test with long identifier (> 100 characters)
         long_identifier = "a" * 150
         cache_key = cache_manager._make_key("guide", long_identifier)
-        
+
         # Extract the hashed part from the cache key
         # Format is "repairgpt:guide:{hash}"
         hashed_part = cache_key.split(":")[-1]
-        
-        # SHA-256 produces 64-character hex strings
-        assert len(hashed_part) == 64
-        
-        # Verify it's actually SHA-256
-        expected_hash = hashlib.sha256(long_identifier.encode()).hexdigest()
+
+        # BLAKE2b-128 produces 32-character hex strings
+        assert len(hashed_part) == 32
+
+        # Verify it's actually BLAKE2b-128
+        expected_hash = hashlib.blake2b(long_identifier.encode(), digest_size=16).hexdigest()
         assert hashed_part == expected_hash
-        
-    def test_cache_manager_short_identifiers_unchanged(self):
-        """Test that short identifiers are not hashed."""
+
+    def test_cache_manager_short_identifiers_hashed(self):
+        """Test that short identifiers are hashed to the same fixed length."""
         cache_manager = CacheManager()
-        
+
         # Test with short identifier
         short_identifier = "short_id"
         cache_key = cache_manager._make_key("guide", short_identifier)
-        
-        # Should be "repairgpt:guide:short_id"
-        assert cache_key == f"repairgpt:guide:{short_identifier}"
-        
-    def test_search_cache_key_uses_sha256(self):
-        """Test that search cache key generation uses SHA-256."""
+
+        expected_hash = hashlib.blake2b(short_identifier.encode(), digest_size=16).hexdigest()
+        assert cache_key == f"repairgpt:guide:{expected_hash}"
+
+    def test_search_cache_key_uses_blake2b(self):
+        """Test that search cache key generation produces a BLAKE2b-128 digest."""
         service = RepairGuideService(enable_offline_fallback=False)
         filters = SearchFilters(device_type="iPhone", difficulty_level="easy", category="screen repair")
-        
+
         # Create a query that will result in a long cache key
         long_query = "a" * 200
         cache_key = service._create_search_cache_key(long_query, filters, 10)
-        
-        # SHA-256 produces 64-character hex strings
-        assert len(cache_key) == 64
-        
+
+        # BLAKE2b-128 produces 32-character hex strings
+        assert len(cache_key) == 32
+
         # Verify it's a valid hex string
         int(cache_key, 16)  # This will raise ValueError if not valid hex
-        
-    def test_sha256_different_inputs_produce_different_hashes(self):
-        """Test that different inputs produce different SHA-256 hashes."""
+
+    def test_search_cache_key_covers_all_filter_fields(self):
+        """Test that every filter field, not just a few, contributes to the search key."""
+        service = RepairGuideService(enable_offline_fallback=False)
+
+        key1 = service._create_search_cache_key("iPhone", SearchFilters(required_tools=["spudger"]), 10)
+        key2 = service._create_search_cache_key("iPhone", SearchFilters(required_tools=["heat gun"]), 10)
+        key3 = service._create_search_cache_key("iPhone", SearchFilters(required_tools=["spudger"]), 10)
+
+        assert key1 != key2
+        assert key1 == key3
+
+    def test_different_inputs_produce_different_hashes(self):
+        """Test that different inputs produce different hashes."""
         cache_manager = CacheManager()
-        
+
         id1 = "a" * 150
         id2 = "b" * 150
-        
+
         key1 = cache_manager._make_key("guide", id1)
         key2 = cache_manager._make_key("guide", id2)
-        
+
         # Different inputs should produce different cache keys
         assert key1 != key2
 
@@ -176,6 +186,41 @@ class TestPerformanceOptimizations:
         assert filters.normalize_japanese_category(None) == None
 
 
+class TestFilterNormalizationOncePerSearch:
+    """Test that a search normalizes its difficulty and category filters only once."""
+
+    @pytest.mark.asyncio
+    async def test_ifixit_search_reuses_normalized_filters(self):
+        """search_guides hands its normalized filter values to the iFixit filtering step."""
+        from src.services import repair_guide_service
+        from src.services.repair_guide_service import Guide
+
+        service = RepairGuideService(enable_offline_fallback=False)
+        service.rate_limiter.can_make_request = MagicMock(return_value=True)
+        service.ifixit_client = MagicMock()
+        service.ifixit_client.search_guides.return_value = [
+            Guide(
+                guideid=guideid, title=f"Guide {guideid}", url="u", summary="", difficulty="Easy",
+                tools=[], parts=[], category="Screen Repair", device="iPhone",
+            )
+            for guideid in range(5)
+        ]
+        filters = SearchFilters(difficulty_level="初心者", category="画面修理")
+
+        difficulty_fn = repair_guide_service._normalize_japanese_difficulty
+        category_fn = repair_guide_service._normalize_japanese_category
+        with patch.object(
+            repair_guide_service, "_normalize_japanese_difficulty", wraps=difficulty_fn
+        ) as normalize_difficulty, patch.object(
+            repair_guide_service, "_normalize_japanese_category", wraps=category_fn
+        ) as normalize_category:
+            results = await service.search_guides("screen", filters, use_cache=False, enhance_related=False)
+
+        assert len(results) == 5
+        assert normalize_difficulty.call_count == 1
+        assert normalize_category.call_count == 1
+
+
 class TestTypeSafetyImprovements:
     """Test type safety improvements."""
     
@@ -282,6 +327,56 @@ class TestEnhancedErrorHandling:
             assert "unexpected error" in error_message.lower()
 
 
+class TestRelatedGuideEnhancement:
+    """Test that related guides are fetched once per device, concurrently."""
+
+    def _result(self, guideid, device):
+        from datetime import datetime
+
+        from src.services.repair_guide_service import Guide, RepairGuideResult
+
+        guide = Guide(
+            guideid=guideid, title=f"Guide {guideid}", url="u", summary="", difficulty="Easy",
+            tools=[], parts=[], category="c", device=device,
+        )
+        return RepairGuideResult(guide=guide, source="ifixit", confidence_score=0.5, last_updated=datetime.now())
+
+    @pytest.mark.asyncio
+    async def test_one_related_search_per_device(self):
+        """Results sharing a device share one related search, minus the guide itself."""
+        service = RepairGuideService(enable_offline_fallback=False)
+        results = [self._result(1, "iPhone"), self._result(2, "iPhone"), self._result(3, "Switch")]
+        related = {"iPhone": [self._result(1, "iPhone"), self._result(4, "iPhone")], "Switch": []}
+
+        async def fake_search(device, **kwargs):
+            return related[device]
+
+        with patch.object(service, "search_guides", side_effect=fake_search) as mock_search:
+            await service._enhance_with_related_guides(results)
+
+        assert sorted(c.args[0] for c in mock_search.call_args_list) == ["Switch", "iPhone"]
+        assert [g.guideid for g in results[0].related_guides] == [4]
+        assert [g.guideid for g in results[1].related_guides] == [1, 4]
+        assert results[2].related_guides == []
+
+    @pytest.mark.asyncio
+    async def test_failed_device_search_does_not_affect_others(self):
+        """A failing related search only leaves its own results unenhanced."""
+        service = RepairGuideService(enable_offline_fallback=False)
+        results = [self._result(1, "iPhone"), self._result(2, "Switch")]
+
+        async def fake_search(device, **kwargs):
+            if device == "iPhone":
+                raise ConnectionError("down")
+            return [self._result(5, "Switch")]
+
+        with patch.object(service, "search_guides", side_effect=fake_search):
+            await service._enhance_with_related_guides(results)
+
+        assert results[0].related_guides is None
+        assert [g.guideid for g in results[1].related_guides] == [5]
+
+
 class TestBackwardsCompatibility:
     """Test that changes maintain backwards compatibility."""
     
@@ -336,7 +431,7 @@ class TestIntegrationScenarios:
     """Test integration scenarios that combine multiple improvements."""
     
     def test_japanese_category_search_with_caching(self):
-        """Test Japanese category search with SHA-256 caching."""
+        """Test Japanese category search with hashed cache keys."""
         service = RepairGuideService(enable_offline_fallback=False)
         filters = SearchFilters(category="画面修理")  # Japanese category
         
@@ -344,9 +439,9 @@ class TestIntegrationScenarios:
         normalized = filters.normalize_japanese_category("画面修理")
         assert normalized == "screen repair"
         
-        # Cache key should use SHA-256
+        # Cache key should use BLAKE2b-128
         cache_key = service._create_search_cache_key("iPhone", filters, 10)
-        assert len(cache_key) == 64  # SHA-256 produces 64-char hex
+        assert len(cache_key) == 32  # BLAKE2b-128 produces 32-char hex
     
     async def test_error_handling_with_japanese_support(self):
         """Test error handling works correctly with Japanese features."""
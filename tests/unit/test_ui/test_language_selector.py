@@ -0,0 +1,48 @@
+"""
+Tests for the language selector component
+"""
+
+import json
+
+import pytest
+
+from i18n import i18n
+from ui.language_selector import get_localized_device_categories, get_localized_skill_levels
+
+
+@pytest.fixture
+def english_i18n():
+    """Use English labels and restore the shipped translations afterwards"""
+    original_language = i18n.get_language()
+    i18n.set_language("en")
+    yield i18n
+    i18n.reload_translations()
+    i18n.set_language(original_language)
+
+
+class TestLocalizedLists:
+    """Test the localized sidebar selector lists"""
+
+    def test_lists_follow_current_language(self, english_i18n):
+        """Labels are translated with the active language"""
+        english_levels = get_localized_skill_levels()
+        assert len(english_levels) == 3
+
+        english_i18n.set_language("ja")
+        assert get_localized_skill_levels() != english_levels
+
+    def test_lists_are_independent_copies(self, english_i18n):
+        """Mutating a returned list does not affect later calls"""
+        get_localized_device_categories().clear()
+        assert get_localized_device_categories()
+
+    def test_reload_translations_refreshes_labels(self, english_i18n, tmp_path, monkeypatch):
+        """Reloaded translation files show up without serving stale labels"""
+        get_localized_skill_levels()
+
+        locale = {"skill_levels": {"beginner": "Novice", "intermediate": "Mid", "expert": "Pro"}}
+        (tmp_path / "en.json").write_text(json.dumps(locale), encoding="utf-8")
+        monkeypatch.setattr(english_i18n, "locales_dir", tmp_path)
+        english_i18n.reload_translations()
+
+        assert get_localized_skill_levels() == ["Novice", "Mid", "Pro"]
@@ -161,6 +161,59 @@ class TestJapaneseDeviceMapper:
         result = self.mapper.find_best_match("すい", threshold=0.9)
         assert result is None
 
+    def test_fuzzy_matching_pruning_matches_full_scan(self):
+        """Test that the SequenceMatcher fallback returns what a full scan returns"""
+        from difflib import SequenceMatcher
+
+        def full_scan(name, threshold):
+            normalized_input = self.mapper._normalize_text(name)
+            best_match, best_score = None, 0.0
+            for normalized_key, english_name in self.mapper._normalized_mappings.items():
+                similarity = SequenceMatcher(None, normalized_input, normalized_key).ratio()
+                if similarity > best_score and similarity >= threshold:
+                    best_match, best_score = english_name, similarity
+            return (best_match, best_score) if best_match else None
+
+        with patch("src.utils.japanese_device_mapper.RAPIDFUZZ_AVAILABLE", False):
+            for name in ["すいち", "あいふお", "ぷれすて", "macbok", "xyz", "the", "ギャラクシ"]:
+                for threshold in (0.0, 0.5, 0.7):
+                    assert self.mapper.find_best_match(name, threshold) == full_scan(name, threshold)
+
+    def test_fuzzy_matching_rapidfuzz_path_matches_full_scan(self):
+        """Test that rapidfuzz pruning keeps the SequenceMatcher scores and matches"""
+        pytest.importorskip("rapidfuzz")
+
+        for name in ["すいち", "あいふお", "ぷれすて", "macbok", "xyz", "the", "ギャラクシ", "スイッチ画面割れ"]:
+            for threshold in (0.0, 0.5, 0.6, 0.7, 1.0):
+                with patch("src.utils.japanese_device_mapper.RAPIDFUZZ_AVAILABLE", False):
+                    expected = self.mapper.find_best_match(name, threshold)
+                with patch("src.utils.japanese_device_mapper.RAPIDFUZZ_AVAILABLE", True):
+                    assert self.mapper.find_best_match(name, threshold) == expected
+
+    @pytest.mark.parametrize(
+        "name,threshold,expected",
+        [
+            ("すいち", 0.7, ("Nintendo Switch", 6 / 7)),
+            ("ipone", 0.7, ("iPhone", 10 / 11)),
+            ("macbok", 0.7, ("MacBook", 12 / 13)),
+            ("あいふお", 0.6, ("iPhone", 2 / 3)),
+            ("あいふお", 0.7, None),
+            ("スイッチ画面割れ", 0.7, None),
+        ],
+    )
+    def test_fuzzy_matching_rapidfuzz_pinned_matches(self, name, threshold, expected):
+        """Test pinned rapidfuzz-path results, including matches right around the threshold"""
+        pytest.importorskip("rapidfuzz")
+
+        with patch("src.utils.japanese_device_mapper.RAPIDFUZZ_AVAILABLE", True):
+            result = self.mapper.find_best_match(name, threshold)
+
+        if expected is None:
+            assert result is None
+        else:
+            assert result[0] == expected[0]
+            assert result[1] == pytest.approx(expected[1])
+
     def test_multiple_matches(self):
         """Test getting multiple possible matches"""
         matches = self.mapper.get_possible_matches("プレ", max_results=3)